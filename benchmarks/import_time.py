@@ -0,0 +1,63 @@
+"""
+Import-time benchmark for hw5lib.
+
+Each statement runs in a fresh interpreter (so nothing is cached in
+sys.modules) and the median wall time over several runs is reported, together
+with whether sklearn ended up imported.
+
+Usage:
+    python benchmarks/import_time.py [--repeats 7]
+
+Compare against an older revision by running the script from a checkout of it.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+STATEMENTS = [
+    "import pandas",
+    "import hw5lib",
+    "from hw5lib import NaNMeanFiller",
+    "from hw5lib import Pipeline",
+    "from hw5lib import DiabetesModel; DiabetesModel(['age'], 'y')",
+]
+
+PROBE = """
+import sys, time
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start, 'sklearn' in sys.modules)
+"""
+
+
+def time_statement(statement: str, repeats: int):
+    times, loads_sklearn = [], False
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(src=str(SRC), statement=statement)],
+            capture_output=True, text=True, check=True,
+        ).stdout.split()
+        times.append(float(out[0]))
+        loads_sklearn = out[1] == "True"
+    return statistics.median(times), loads_sklearn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=7, help="Fresh interpreters per statement")
+    args = parser.parse_args()
+
+    print(f"{'statement':<64} {'median ms':>10} {'sklearn':>8}")
+    for statement in STATEMENTS:
+        seconds, loads_sklearn = time_statement(statement, args.repeats)
+        print(f"{statement:<64} {seconds * 1000:>10.1f} {str(loads_sklearn):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Pattern-counting benchmark for hw4.count_patterns.
+
+Times every counting method on the same synthetic corpus for a range of
+pattern counts, to show where the pure-Python and compiled Aho-Corasick
+automatons overtake one str.count pass per pattern. The thresholds
+PYAHOCORASICK_MIN_PATTERNS and AUTOMATON_MIN_PATTERNS in hw4.py come from
+this benchmark.
+
+Usage:
+    python benchmarks/pattern_count.py [--lines 90000] [--patterns 5 50 200 1000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import hw4  # noqa: E402
+
+
+def make_corpus(n_lines: int, seed: int = 0):
+    rng = random.Random(seed)
+    vocab = list(dict.fromkeys(
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 10)))
+        for _ in range(5000)
+    ))
+    lines = [" ".join(rng.choice(vocab) for _ in range(12)) for _ in range(n_lines)]
+    return vocab, lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=90_000, help="Lines of ~90 characters in the corpus")
+    parser.add_argument("--patterns", type=int, nargs="+", default=[5, 50, 200, 1000])
+    args = parser.parse_args()
+
+    vocab, lines = make_corpus(args.lines)
+    methods = [m for m in hw4.COUNT_METHODS if m != "pyahocorasick" or hw4.ahocorasick is not None]
+    print(f"corpus: {sum(map(len, lines)) / 1e6:.1f} MB")
+    print(f"{'patterns':>8} " + " ".join(f"{m:>14}" for m in methods) + f" {'auto picks':>14}")
+    for n_patterns in args.patterns:
+        patterns = random.Random(n_patterns).sample(vocab, n_patterns)
+        seconds = []
+        for method in methods:
+            start = time.perf_counter()
+            hw4.count_patterns(lines, patterns, method=method)
+            seconds.append(time.perf_counter() - start)
+        picked = hw4.build_counter(patterns)[1]
+        print(f"{n_patterns:>8} " + " ".join(f"{s:>13.2f}s" for s in seconds) + f" {picked:>14}")
+
+
+if __name__ == "__main__":
+    main()
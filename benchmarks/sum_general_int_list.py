@@ -0,0 +1,72 @@
+"""
+Benchmark for hw4.sum_general_int_list.
+
+Compares the current implementation with the original recursive version on
+the input shapes from the homework: the example list repeated, shallow mixed
+nesting, moderately deep nesting and one long flat list. The best of several
+runs is reported.
+
+Usage:
+    python benchmarks/sum_general_int_list.py [--repeats 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import hw4  # noqa: E402
+
+
+def recursive_sum(lst):
+    # Original implementation, kept as the reference
+    total = 0
+    for item in lst:
+        if isinstance(item, int):
+            total += item
+        elif isinstance(item, list):
+            total += recursive_sum(item)
+    return total
+
+
+def deep_list(depth):
+    lst = [1]
+    for _ in range(depth):
+        lst = [lst, 1]
+    return lst
+
+
+CASES = {
+    "example list x 1e5": [[2], 4, 5, [1, [2], [3, 5, [7, 8]], 10], 1] * 100_000,
+    "[[i, [i]]] x 5e5": [[i, [i]] for i in range(500_000)],
+    "800-deep x 200": [deep_list(800) for _ in range(200)],
+    "flat 2M ints": list(range(2_000_000)),
+}
+
+
+def best_time(fn, data, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(data)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per case (best is reported)")
+    args = parser.parse_args()
+
+    print(f"{'case':<22} {'recursive':>10} {'current':>10} {'speedup':>8}")
+    for name, data in CASES.items():
+        assert hw4.sum_general_int_list(data) == recursive_sum(data)
+        old = best_time(recursive_sum, data, args.repeats)
+        new = best_time(hw4.sum_general_int_list, data, args.repeats)
+        print(f"{name:<22} {old:>9.3f}s {new:>9.3f}s {old / new:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
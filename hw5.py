@@ -71,6 +71,132 @@ class Patient:
             return probability
 
 
+#
+# 1.4)
+# "PatientRegistry" stores many patients column-wise so that has_covid
+# can be computed for a whole hospital census in one call.
+#
+# - symptoms are bitsets: every symptom seen gets a bit position in a
+#   vocabulary, and each patient has one uint64 word per 64 symptoms
+# - tests are int8 arrays, one per test name: -1 = not taken, 0 = False, 1 = True
+#
+# has_covid() gives exactly the same floats as Patient.has_covid, because the
+# per-symptom-count probabilities are built with the same sequence of
+# additions (0.05 + 0.1 + 0.1 ...) instead of 0.05 + 0.1 * count.
+import numpy as np
+
+COVID_SYMPTOMS = ["fever", "cough", "anosmia"]
+
+
+class PatientRegistry:
+    def __init__(self, capacity: int = 1024):
+        self.names = []
+        self.symptom_index = {}  # symptom -> bit position
+        self._size = 0
+        self._bits = np.zeros((max(capacity, 1), 1), dtype=np.uint64)
+        self._tests = {}  # test name -> int8 array
+
+    def __len__(self):
+        return self._size
+
+    def _grow(self, needed):
+        # double the capacity (amortized O(1) appends)
+        capacity = len(self._bits)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, 2 * capacity)
+        self._bits = np.concatenate([self._bits, np.zeros((new_capacity - capacity, self._bits.shape[1]), dtype=np.uint64)])
+        for name, column in self._tests.items():
+            self._tests[name] = np.concatenate([column, np.full(new_capacity - capacity, -1, dtype=np.int8)])
+
+    def _symptom_bit(self, symptom):
+        if symptom not in self.symptom_index:
+            self.symptom_index[symptom] = len(self.symptom_index)
+            n_words = len(self.symptom_index) // 64 + 1
+            if n_words > self._bits.shape[1]:
+                self._bits = np.hstack([self._bits, np.zeros((len(self._bits), 1), dtype=np.uint64)])
+        return self.symptom_index[symptom]
+
+    def _symptom_mask(self, symptoms):
+        mask = 0
+        for symptom in set(symptoms):
+            mask |= 1 << self._symptom_bit(symptom)
+        return mask
+
+    def _set_masks(self, rows, masks):
+        for word in range(self._bits.shape[1]):
+            self._bits[rows, word] = [(mask >> (64 * word)) & 0xFFFFFFFFFFFFFFFF for mask in masks]
+
+    def add_patient(self, name: str, symptoms: list) -> int:
+        # returns the row index of the new patient
+        mask = self._symptom_mask(symptoms)
+        row = self._size
+        self._grow(row + 1)
+        self._set_masks([row], [mask])
+        self.names.append(name)
+        self._size += 1
+        return row
+
+    def add_test(self, row: int, test_name: str, result: bool):
+        if not 0 <= row < self._size:
+            raise IndexError(f"Patient row {row} out of range")
+        if test_name not in self._tests:
+            self._tests[test_name] = np.full(len(self._bits), -1, dtype=np.int8)
+        self._tests[test_name][row] = 1 if result else 0
+
+    @classmethod
+    def from_patients(cls, patients):
+        # bulk load existing Patient objects (symptoms and tests)
+        registry = cls(capacity=len(patients))
+        masks = [registry._symptom_mask(p.symptoms) for p in patients]
+        registry._set_masks(np.arange(len(patients)), masks)
+        registry.names = [p.name for p in patients]
+        registry._size = len(patients)
+
+        for test_name in {name for p in patients for name in p.tests}:
+            column = np.full(len(registry._bits), -1, dtype=np.int8)
+            column[:len(patients)] = [-1 if test_name not in p.tests else (1 if p.tests[test_name] else 0)
+                                      for p in patients]
+            registry._tests[test_name] = column
+        return registry
+
+    def test_results(self, test_name: str):
+        # int8 array: -1 = not taken, 0 = False, 1 = True
+        if test_name not in self._tests:
+            return np.full(self._size, -1, dtype=np.int8)
+        return self._tests[test_name][:self._size]
+
+    def has_symptom(self, symptom: str):
+        if symptom not in self.symptom_index:
+            return np.zeros(self._size, dtype=bool)
+        bit = self.symptom_index[symptom]
+        word = self._bits[:self._size, bit // 64]
+        return ((word >> np.uint64(bit % 64)) & np.uint64(1)).astype(bool)
+
+    def to_patient(self, row: int) -> Patient:
+        bits = self._bits[row]
+        symptoms = [s for s, bit in self.symptom_index.items() if (int(bits[bit // 64]) >> (bit % 64)) & 1]
+        patient = Patient(self.names[row], symptoms)
+        for test_name, column in self._tests.items():
+            if column[row] != -1:
+                patient.add_test(test_name, bool(column[row]))
+        return patient
+
+    def has_covid(self):
+        # Rule 2 for everyone: number of covid symptoms -> probability lookup
+        n_symptoms = sum(self.has_symptom(symptom).astype(np.int8) for symptom in COVID_SYMPTOMS)
+        lookup = [0.05]
+        for _ in COVID_SYMPTOMS:
+            lookup.append(lookup[-1] + 0.1)
+        probability = np.asarray(lookup)[n_symptoms]
+
+        # Rule 1 overrides when a covid test was taken
+        covid = self.test_results("covid")
+        probability[covid == 1] = 0.99
+        probability[covid == 0] = 0.01
+        return probability
+
+
 ######################
 
 # 2. In this exercise you will make an English Deck class made of Card classes
@@ -85,6 +211,9 @@ class Patient:
 
 
 class Card:
+    # __slots__ drops the per-instance __dict__ (two references instead of a dict)
+    __slots__ = ("suit", "value")
+
     def __init__(self, suit: str, value: str):
         self.suit = suit
         self.value = value
@@ -92,38 +221,122 @@ class Card:
     def __str__(self):
         return f"{self.value} of {self.suit}"
 
+    @classmethod
+    def from_code(cls, code: int) -> "Card":
+        # shared (flyweight) instance for a card code 0..51, see Deck below
+        return _CARDS[code]
+
 
 # 2.2) Create a Deck class called "Deck".
 # The constructor will create an English Deck (suits: Hearts, Diamonds, Clubs, Spades and values: A, 2, 3, 4, 5, 6, 7, 8, 9, 10, J, Q, K). It will create a list of cards that contain each of the existing cards in an English Deck.
 # Create a method called "shuffle" that shuffles the cards randomly.
 # Create a method called "draw" that will draw a single card and print the suit and value. When a card is drawn, the card should be removed from the deck.
+#
+# The deck stores its cards as an int8 array of codes (code = suit_index * 13 + value_index)
+# instead of 52 objects. The 52 possible Card objects are created once and shared,
+# and "cards" / "draw" hand out those shared instances. "cards" is a read-only
+# tuple built from the codes, so deck.cards.pop() / .append() fail loudly instead
+# of silently editing a copy; use draw() or assign a new sequence to deck.cards.
 import random  # import random module to shuffle
 
+SUITS = ["Hearts", "Diamonds", "Clubs", "Spades"]
+VALUES = ["A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K"]
+_CARDS = tuple(Card(suit, value) for suit in SUITS for value in VALUES)
+_CARD_CODES = {(card.suit, card.value): code for code, card in enumerate(_CARDS)}
+
 
 class Deck:
     def __init__(self):
-        # now we create the deck of cards
-        suits = ["Hearts", "Diamonds", "Clubs", "Spades"]
-        values = ["A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K"]
-        # creation of every combination of suit and value
-        self.cards = []
-        for suit in suits:
-            for value in values:
-                self.cards.append(Card(suit, value))
+        # every combination of suit and value, in suit-major order
+        self.codes = np.arange(len(_CARDS), dtype=np.int8)
+
+    @property
+    def cards(self):
+        # read-only tuple of Card views, in deck order (the last one is drawn next)
+        return tuple(_CARDS[code] for code in self.codes.tolist())
+
+    @cards.setter
+    def cards(self, cards):
+        self.codes = np.array([_CARD_CODES[(card.suit, card.value)] for card in cards], dtype=np.int8)
+
+    def __len__(self):
+        return len(self.codes)
 
     def shuffle(self):
-        random.shuffle(self.cards)
+        # seeded from the random module, so random.seed() still makes shuffles reproducible
+        rng = np.random.default_rng(random.getrandbits(64))
+        self.codes = rng.permutation(self.codes)
 
     def draw(self):
-        if len(self.cards) == 0:
+        if len(self.codes) == 0:
             print("There are no cards left in the deck.")
             return None
 
-        card = self.cards.pop()  # remove and return the last card
+        card = _CARDS[self.codes[-1]]  # remove and return the last card
+        self.codes = self.codes[:-1]
         print(f"Drew this card: {card}")
         return card
 
 
+# 2.3) Batch version of Deck for Monte Carlo simulations.
+# "DeckBatch" holds M decks as an (M, 52) int8 matrix of card codes.
+# shuffle() permutes every row at once with a NumPy Generator and
+# draw(k) removes the last k cards of every deck in one operation, silently.
+# "simulate_draws" splits a large run in chunks, gives each chunk its own
+# seed stream (SeedSequence.spawn) and runs the chunks in a process pool;
+# the result only depends on the seed, not on the number of processes.
+from concurrent.futures import ProcessPoolExecutor
+
+
+class DeckBatch:
+    def __init__(self, n_decks: int, rng=None):
+        self.rng = np.random.default_rng(rng)
+        self.codes = np.tile(np.arange(len(_CARDS), dtype=np.int8), (n_decks, 1))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def shuffle(self):
+        self.codes = self.rng.permuted(self.codes, axis=1)
+
+    def draw(self, k: int = 1):
+        # (M, k) codes in the order Deck.draw would return them (last card first)
+        if not 0 <= k <= self.codes.shape[1]:
+            raise ValueError(f"Cannot draw {k} cards from decks with {self.codes.shape[1]} cards")
+        drawn = self.codes[:, self.codes.shape[1] - k:][:, ::-1]
+        self.codes = self.codes[:, :self.codes.shape[1] - k]
+        return drawn
+
+    @staticmethod
+    def to_cards(codes):
+        # shared Card instances for an array of codes
+        return [[_CARDS[code] for code in row] for row in np.atleast_2d(codes).tolist()]
+
+
+def _draw_chunk(seed, n_decks, k):
+    batch = DeckBatch(n_decks, seed)
+    batch.shuffle()
+    return batch.draw(k)
+
+
+def simulate_draws(n_decks: int, k: int, seed=None, chunk_size: int = 100_000, n_jobs=None):
+    # returns an (n_decks, k) int8 array with the first k cards drawn from each shuffled deck
+    sizes = [min(chunk_size, n_decks - start) for start in range(0, n_decks, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if n_jobs == 1 or len(sizes) <= 1:
+        chunks = [_draw_chunk(s, n, k) for s, n in zip(seeds, sizes)]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            chunks = list(executor.map(_draw_chunk, seeds, sizes, [k] * len(sizes)))
+    return np.concatenate(chunks) if chunks else np.empty((0, k), dtype=np.int8)
+
+"""
+# probability that the first two cards drawn are both aces
+draws = simulate_draws(1_000_000, 2, seed=42)
+print(np.mean((draws % 13 == 0).all(axis=1)))  # about 1/221 = 0.0045
+"""
+
+
 ###################
 
 # 3. In this exercise you will create an interface that will serve as template
@@ -216,3 +429,79 @@ class Circle(PlaneFigure):
         # Area = π * radius^2
 
         return math.pi * (self.radius**2)
+
+
+# 3.4 "FigureArray" stores many figures column-wise: one contiguous NumPy array per
+# parameter of each figure type. compute_perimeter() and compute_surface() evaluate
+# every figure with one vectorized expression per type (same formulas as the classes
+# above, so the results are identical) and return them in insertion order.
+
+
+class FigureArray:
+    # figure type -> constructor parameters, perimeter formula, surface formula
+    FIELDS = {
+        Triangle: ("base", "c1", "c2", "h"),
+        Rectangle: ("a", "b"),
+        Circle: ("radius",),
+    }
+    PERIMETER = {
+        Triangle: lambda c: c["base"] + c["c1"] + c["c2"],
+        Rectangle: lambda c: 2 * (c["a"] + c["b"]),
+        Circle: lambda c: 2 * math.pi * c["radius"],
+    }
+    SURFACE = {
+        Triangle: lambda c: 0.5 * c["base"] * c["h"],
+        Rectangle: lambda c: c["a"] * c["b"],
+        # float_power calls libm pow() like Python's **; ndarray ** 2 squares (x * x),
+        # which can differ from Circle.compute_surface in the last bit
+        Circle: lambda c: math.pi * np.float_power(c["radius"], 2),
+    }
+
+    def __init__(self, triangles=None, rectangles=None, circles=None):
+        """
+        Build from parameter arrays; figures are ordered triangles, rectangles, circles.
+        triangles: (N, 4) base, c1, c2, h / rectangles: (N, 2) a, b / circles: (N,) radius
+        """
+        self.columns = {}
+        self.positions = {}  # figure type -> positions of its figures in the output
+        start = 0
+        for figure_type, params in zip(self.FIELDS, (triangles, rectangles, circles)):
+            fields = self.FIELDS[figure_type]
+            params = np.zeros((0, len(fields))) if params is None else np.asarray(params, dtype=np.float64)
+            params = params.reshape(-1, len(fields))
+            self.columns[figure_type] = {field: np.ascontiguousarray(params[:, i]) for i, field in enumerate(fields)}
+            self.positions[figure_type] = np.arange(start, start + len(params))
+            start += len(params)
+        self._size = start
+
+    def __len__(self):
+        return self._size
+
+    @classmethod
+    def from_figures(cls, figures):
+        # bulk conversion of existing PlaneFigure objects, keeping their order
+        by_type = {figure_type: [] for figure_type in cls.FIELDS}
+        for position, figure in enumerate(figures):
+            if type(figure) not in by_type:
+                raise TypeError(f"Unsupported figure type: {type(figure).__name__}")
+            by_type[type(figure)].append(position)
+
+        params = [[[getattr(figures[p], field) for field in cls.FIELDS[figure_type]] for p in by_type[figure_type]]
+                  for figure_type in cls.FIELDS]
+        figure_array = cls(*params)
+        for figure_type, positions in by_type.items():
+            figure_array.positions[figure_type] = np.asarray(positions, dtype=np.intp)
+        return figure_array
+
+    def _evaluate(self, formulas):
+        result = np.empty(self._size)
+        for figure_type, formula in formulas.items():
+            if len(self.positions[figure_type]):
+                result[self.positions[figure_type]] = formula(self.columns[figure_type])
+        return result
+
+    def compute_perimeter(self):
+        return self._evaluate(self.PERIMETER)
+
+    def compute_surface(self):
+        return self._evaluate(self.SURFACE)
@@ -1,3 +1,6 @@
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
 from sklearn.metrics import roc_auc_score
 
 def compute_auc(df):
@@ -6,3 +9,275 @@ def compute_auc(df):
         return roc_auc_score(df["diabetes_mellitus"], df["predictions"])
     except KeyError:
         raise KeyError("Missing required columns: 'diabetes_mellitus' or 'predictions'.")
+
+
+def _get_labels_and_scores(df):
+    """Binary labels (True = positive class) and scores as arrays."""
+    try:
+        y, scores = df["diabetes_mellitus"].to_numpy(), df["predictions"].to_numpy(dtype=float)
+    except KeyError:
+        raise KeyError("Missing required columns: 'diabetes_mellitus' or 'predictions'.")
+    labels = np.unique(y)
+    if len(labels) != 2:
+        raise ValueError(f"Expected a binary target, found labels {labels.tolist()}.")
+    return y == labels[1], scores
+
+
+def _tie_starts(sorted_scores):
+    """Start position of each run of equal scores in a sorted score array."""
+    return np.flatnonzero(np.r_[True, sorted_scores[1:] != sorted_scores[:-1]])
+
+
+def _cell_counts(is_pos, tie_starts):
+    """Positive/negative counts per tie group, and each sample's (group, class) cell.
+
+    Cells 0..G-1 hold positives of each tie group and cells G..2G-1 negatives.
+    """
+    group = np.repeat(np.arange(len(tie_starts)), np.diff(np.r_[tie_starts, len(is_pos)]))
+    cells = np.where(is_pos, group, group + len(tie_starts))
+    counts = np.bincount(cells, minlength=2 * len(tie_starts))
+    return counts[:len(tie_starts)], counts[len(tie_starts):], cells
+
+
+def _weighted_auc(pos, neg):
+    """AUC from (B, G) positive/negative weights per ascending tie group.
+
+    Ties count as half, matching roc_auc_score.
+    """
+    neg_below = np.cumsum(neg, axis=1) - neg
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (pos * (neg_below + 0.5 * neg)).sum(axis=1) / (pos.sum(axis=1) * neg.sum(axis=1))
+
+
+def _bootstrap_aucs(pos, neg, cells, n_resamples, seed, batch_size):
+    """AUCs of n_resamples bootstrap resamples, drawn in batches.
+
+    Resampling rows with replacement only changes the counts per (tie group,
+    class) cell. With heavy ties these are drawn directly as multinomial counts
+    over the 2 * G cells; otherwise row indices are drawn and binned.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(cells)
+    n_groups = len(pos)
+    pvals = np.concatenate([pos, neg]) / n
+    aucs = []
+    for start in range(0, n_resamples, batch_size):
+        size = min(batch_size, n_resamples - start)
+        if 8 * n_groups < n:
+            counts = rng.multinomial(n, pvals, size=size)
+        else:
+            offsets = (np.arange(size) * 2 * n_groups)[:, None]
+            drawn = cells[rng.integers(0, n, (size, n))] + offsets
+            counts = np.bincount(drawn.ravel(), minlength=size * 2 * n_groups).reshape(size, -1)
+        aucs.append(_weighted_auc(counts[:, :n_groups], counts[:, n_groups:]))
+    return np.concatenate(aucs) if aucs else np.empty(0)
+
+
+def compute_auc_ci(df, n_bootstrap=2000, alpha=0.05, n_jobs=-1, random_state=None, batch_size=None):
+    """Compute ROC AUC with a percentile bootstrap confidence interval.
+
+    Scores are sorted once; each resample is a vector of multinomial counts
+    over the sorted (tie group, class) cells, so a batch of resamples is scored
+    with a few vectorized cumulative sums. Every fixed-size batch gets its own
+    seed (SeedSequence.spawn) and batches are spread over n_jobs workers, so
+    the result depends on random_state but not on n_jobs. Returns a dict with
+    auc, ci_lower, ci_upper and std_error.
+    """
+    is_pos, scores = _get_labels_and_scores(df)
+    order = np.argsort(scores, kind="mergesort")
+    pos, neg, cells = _cell_counts(is_pos[order], _tie_starts(scores[order]))
+
+    auc = _weighted_auc(pos[None, :], neg[None, :])[0]
+
+    if batch_size is None:
+        # At most 256 resamples per batch, and each batch's draws around 32 MB at most
+        batch_size = max(1, min(n_bootstrap, 256, 2**22 // len(cells)))
+    sizes = [min(batch_size, n_bootstrap - start) for start in range(0, n_bootstrap, batch_size)]
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+    n_workers = max(1, min(effective_n_jobs(n_jobs), len(sizes)))
+    boot = np.concatenate(Parallel(n_jobs=n_workers)(
+        delayed(_bootstrap_aucs)(pos, neg, cells, size, seed, size)
+        for size, seed in zip(sizes, seeds)
+    ))
+    boot = boot[~np.isnan(boot)]  # resamples that drew a single class
+
+    lower, upper = np.percentile(boot, [100 * alpha / 2, 100 * (1 - alpha / 2)])
+    return {
+        "auc": float(auc),
+        "ci_lower": float(lower),
+        "ci_upper": float(upper),
+        "std_error": float(np.std(boot, ddof=1)),
+    }
+
+
+def compute_grouped_metrics(df, group_cols="hospital_id"):
+    """Compute AUC, prevalence, counts and mean prediction for every group at once.
+
+    The group key is factorized and rows are sorted once by (group, score);
+    each group's AUC then follows from Mann-Whitney rank sums computed with
+    vectorized bincounts. group_cols may be a column name or a list such as
+    ["hospital_id", "icu_type"]. Groups with a single class get NaN AUC.
+    """
+    is_pos, scores = _get_labels_and_scores(df)
+    if isinstance(group_cols, str):
+        codes, keys = pd.factorize(df[group_cols], sort=True, use_na_sentinel=False)
+        index = pd.Index(keys, name=group_cols)
+    else:
+        grouped = df.groupby(list(group_cols), sort=True, dropna=False)
+        codes = grouped.ngroup().to_numpy()
+        index = grouped.size().index
+    n_groups = len(index)
+
+    order = np.lexsort((scores, codes))
+    codes, scores, is_pos = codes[order], scores[order], is_pos[order]
+
+    # Runs of tied scores within a group share their mean (1-based) rank
+    new_run = np.r_[True, (codes[1:] != codes[:-1]) | (scores[1:] != scores[:-1])]
+    run_starts = np.flatnonzero(new_run)
+    run_ends = np.r_[run_starts[1:], len(scores)] - 1
+    run_id = np.cumsum(new_run) - 1
+    group_starts = np.searchsorted(codes, np.arange(n_groups))
+    ranks = (run_starts[run_id] + run_ends[run_id]) / 2 - group_starts[codes] + 1
+
+    n = np.bincount(codes, minlength=n_groups)
+    n_pos = np.bincount(codes, weights=is_pos, minlength=n_groups)
+    n_neg = n - n_pos
+    pos_rank_sum = np.bincount(codes, weights=ranks * is_pos, minlength=n_groups)
+    score_sum = np.bincount(codes, weights=scores, minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        auc = (pos_rank_sum - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+
+    return pd.DataFrame({
+        "n": n,
+        "n_pos": n_pos.astype(np.int64),
+        "prevalence": n_pos / n,
+        "mean_prediction": score_sum / n,
+        "auc": auc,
+    }, index=index)
+
+
+def compute_threshold_curves(df, n_calibration_bins=10):
+    """Derive every threshold's confusion counts, ROC/PR curves and calibration from one sort.
+
+    Predictions are sorted once (descending); cumulative sums of the labels
+    give the confusion matrix at every distinct threshold, from which the ROC
+    curve, the PR curve and sensitivity/specificity follow. Calibration uses
+    uniform probability bins located with a binary search on the same sorted
+    array. Returns a dict with "thresholds" (DataFrame), "roc_auc",
+    "average_precision" and "calibration" (DataFrame).
+    """
+    is_pos, scores = _get_labels_and_scores(df)
+    order = np.argsort(-scores, kind="mergesort")
+    scores, is_pos = scores[order], is_pos[order]
+
+    # Last row of each run of tied scores: predicting positive for score >= threshold
+    run_ends = np.r_[np.flatnonzero(scores[1:] != scores[:-1]), len(scores) - 1]
+    tp = np.cumsum(is_pos)[run_ends]
+    fp = run_ends + 1 - tp
+    n_pos, n_neg = tp[-1], fp[-1]
+    fn, tn = n_pos - tp, n_neg - fp
+
+    sensitivity = tp / n_pos
+    fpr = fp / n_neg
+    precision = tp / (tp + fp)
+    thresholds = pd.DataFrame({
+        "threshold": scores[run_ends],
+        "tp": tp,
+        "fp": fp,
+        "tn": tn,
+        "fn": fn,
+        "sensitivity": sensitivity,
+        "specificity": 1 - fpr,
+        "fpr": fpr,
+        "precision": precision,
+    })
+
+    roc_tpr, roc_fpr = np.r_[0, sensitivity], np.r_[0, fpr]
+    roc_auc = np.sum(np.diff(roc_fpr) * (roc_tpr[1:] + roc_tpr[:-1]) / 2)
+    average_precision = np.sum(np.diff(np.r_[0, sensitivity]) * precision)
+
+    # Calibration on ascending scores: bin i covers [edge_i, edge_i+1), the last bin includes 1
+    ascending_scores, ascending_pos = scores[::-1], is_pos[::-1]
+    edges = np.linspace(0, 1, n_calibration_bins + 1)
+    cuts = np.r_[0, np.searchsorted(ascending_scores, edges[1:-1], side="left"), len(scores)]
+    label_sums = np.r_[0, np.cumsum(ascending_pos)][cuts]
+    score_sums = np.r_[0, np.cumsum(ascending_scores)][cuts]
+    counts = np.diff(cuts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        calibration = pd.DataFrame({
+            "bin_lower": edges[:-1],
+            "bin_upper": edges[1:],
+            "n": counts,
+            "mean_prediction": np.diff(score_sums) / counts,
+            "observed_rate": np.diff(label_sums) / counts,
+        })
+
+    return {
+        "thresholds": thresholds,
+        "roc_auc": float(roc_auc),
+        "average_precision": float(average_precision),
+        "calibration": calibration,
+    }
+
+
+class StreamingEvaluator:
+    """Incremental AUC, log-loss and Brier score for chunked predictions.
+
+    Keeps one fixed-size histogram of predicted probabilities per class, so
+    memory is O(n_bins) however many rows are seen. Log-loss and Brier score
+    are exact running sums; AUC treats scores within a bin as tied, so its
+    error is bounded by the share of positive/negative pairs falling in the
+    same bin. Evaluators from different workers can be combined with merge().
+    """
+
+    def __init__(self, n_bins=1000, eps=1e-15):
+        self.n_bins = n_bins
+        self.eps = eps
+        self.pos_hist = np.zeros(n_bins, dtype=np.int64)
+        self.neg_hist = np.zeros(n_bins, dtype=np.int64)
+        self.log_loss_sum = 0.0
+        self.brier_sum = 0.0
+
+    @property
+    def n(self):
+        return int(self.pos_hist.sum() + self.neg_hist.sum())
+
+    def update(self, y, p):
+        """Add a chunk of binary labels (1 = diabetes) and positive-class probabilities."""
+        y = np.asarray(y).astype(bool)
+        p = np.asarray(p, dtype=float)
+        if y.shape != p.shape:
+            raise ValueError(f"Labels and predictions differ in shape: {y.shape} vs {p.shape}.")
+
+        bins = np.clip((p * self.n_bins).astype(np.int64), 0, self.n_bins - 1)
+        self.pos_hist += np.bincount(bins[y], minlength=self.n_bins)
+        self.neg_hist += np.bincount(bins[~y], minlength=self.n_bins)
+
+        clipped = np.clip(p, self.eps, 1 - self.eps)
+        self.log_loss_sum -= np.log(np.where(y, clipped, 1 - clipped)).sum()
+        self.brier_sum += ((p - y) ** 2).sum()
+        return self
+
+    def merge(self, other):
+        """Add the counts of another evaluator (e.g. from a worker process)."""
+        if other.n_bins != self.n_bins:
+            raise ValueError("Cannot merge evaluators with different n_bins.")
+        self.pos_hist += other.pos_hist
+        self.neg_hist += other.neg_hist
+        self.log_loss_sum += other.log_loss_sum
+        self.brier_sum += other.brier_sum
+        return self
+
+    def result(self):
+        """Return a dict with auc, log_loss, brier, n and prevalence."""
+        n = self.n
+        if n == 0:
+            raise ValueError("No predictions seen yet; call update() first.")
+        auc = _weighted_auc(self.pos_hist[None, :], self.neg_hist[None, :])[0]
+        return {
+            "auc": float(auc),
+            "log_loss": self.log_loss_sum / n,
+            "brier": self.brier_sum / n,
+            "n": n,
+            "prevalence": float(self.pos_hist.sum() / n),
+        }
@@ -1,4 +1,7 @@
+import numpy as np
+from joblib import Parallel, delayed
 from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
 from sklearn.model_selection import train_test_split
 
 FEATURES = [
@@ -36,3 +39,88 @@ def add_predictions(df, model, feature_list=None):
     """Add predicted probabilities to dataframe."""
     df["predictions"] = model.predict_proba(df[feature_list or FEATURES])[:, 1]
     return df
+
+
+def to_design_matrix(df, feature_list=None):
+    """Build a float32, column-major design matrix so column ranges are cheap views."""
+    return np.asfortranarray(df[feature_list or FEATURES].to_numpy(dtype=np.float32))
+
+
+def _select_columns(X, columns):
+    """Columns of X; a view when the indices form a contiguous increasing run."""
+    start = columns[0]
+    if list(columns) == list(range(start, start + len(columns))):
+        return X[:, start:start + len(columns)]
+    return X[:, columns]
+
+
+def _nested_chains(feature_subsets):
+    """Group subset positions into chains where each subset contains the previous one."""
+    order = sorted(range(len(feature_subsets)), key=lambda i: len(feature_subsets[i]))
+    chains = []
+    for i in order:
+        subset = set(feature_subsets[i])
+        for chain in chains:
+            last = set(feature_subsets[chain[-1]])
+            if last < subset:
+                chain.append(i)
+                break
+        else:
+            chains.append([i])
+    return chains
+
+
+def _fit_chain(X, y, X_test, y_test, subsets, max_iter):
+    """Fit a chain of nested subsets, warm-starting each fit from the previous one."""
+    results = []
+    previous = None
+    for columns in subsets:
+        model = LogisticRegression(max_iter=max_iter)
+        if previous is not None:
+            prev_columns, prev_model = previous
+            position = {c: k for k, c in enumerate(prev_columns)}
+            coef = np.zeros((1, len(columns)), dtype=prev_model.coef_.dtype)
+            for k, c in enumerate(columns):
+                if c in position:
+                    coef[0, k] = prev_model.coef_[0, position[c]]
+            model.set_params(warm_start=True)
+            model.coef_ = coef
+            model.intercept_ = prev_model.intercept_.copy()
+
+        model.fit(_select_columns(X, columns), y)
+        model.set_params(warm_start=False)
+        auc = roc_auc_score(y_test, model.predict_proba(_select_columns(X_test, columns))[:, 1])
+        results.append((model, auc))
+        previous = (columns, model)
+    return results
+
+
+def train_models(X, y, feature_subsets, X_test, y_test, n_jobs=-1, max_iter=1000):
+    """Train one logistic regression per feature subset from a shared design matrix.
+
+    X and X_test are design matrices (see to_design_matrix) and each subset is a
+    list of column indices into them. Nested subsets are fit in chains that
+    warm-start from the previous coefficients; chains run in parallel across
+    n_jobs workers. Returns one {"features", "model", "auc"} dict per subset,
+    in input order.
+    """
+    X = np.asfortranarray(X, dtype=np.float32)
+    X_test = np.asfortranarray(X_test, dtype=np.float32)
+    y = np.asarray(y)
+    y_test = np.asarray(y_test)
+    feature_subsets = [list(subset) for subset in feature_subsets]
+    for i, subset in enumerate(feature_subsets):
+        if not subset:
+            raise ValueError(f"Feature subset {i} is empty; each subset needs at least one column.")
+
+    chains = _nested_chains(feature_subsets)
+    fitted = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_chain)(X, y, X_test, y_test, [feature_subsets[i] for i in chain], max_iter)
+        for chain in chains
+    )
+
+    results = [None] * len(feature_subsets)
+    for chain, chain_results in zip(chains, fitted):
+        for i, (model, auc) in zip(chain, chain_results):
+            results[i] = {"features": feature_subsets[i], "model": model, "auc": auc}
+    return results
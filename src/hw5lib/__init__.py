@@ -2,29 +2,85 @@
 Diabetes prediction library for data loading, preprocessing, feature engineering, and modeling.
 
 This library provides a complete pipeline for diabetes mellitus prediction including:
-- Data loading and train/test splitting
+- Data loading and train/test splitting, and one-pass stratified sampling of large files
 - Data preprocessing (NaN handling)
 - Feature engineering (BMI, gender encoding, age transformations)
 - Model training and prediction
+- Pipelines that chain the steps above and can be saved/loaded
+- Stratified cross-validation with cached per-fold preprocessing
+- Drift monitoring of scoring batches against training statistics
 """
 
-# Import from data module
-from .data import DataLoader, load_split, DEFAULT_TARGET
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-# Import from preprocessing module
-from .preprocess import NaNRowRemover, NaNMeanFiller
+# Exported names are imported on first access (PEP 562), so `import hw5lib`
+# does not pull in pandas/sklearn-heavy modules that the caller never uses.
+_LAZY_IMPORTS = {
+    # Data loading
+    'DataLoader': '.data',
+    'load_split': '.data',
+    'sample_stratified': '.data',
+    'DEFAULT_TARGET': '.data',
+
+    # Preprocessing
+    'NaNRowRemover': '.preprocess',
+    'NaNMeanFiller': '.preprocess',
+
+    # Features
+    'BaseFeature': '.features',
+    'BMICalculator': '.features',
+    'GenderEncoder': '.features',
+    'AgeSquared': '.features',
+
+    # Models
+    'DiabetesModel': '.model',
+    'register_backend': '.model',
+    'PredictionCache': '.cache',
+
+    # Pipeline
+    'Pipeline': '.pipeline',
+
+    # Validation
+    'CrossValidator': '.validation',
+
+    # Profiling
+    'StageProfiler': '.profiling',
 
-# Import from features module
-from .features import BaseFeature, BMICalculator, GenderEncoder, AgeSquared
+    # Drift monitoring
+    'DriftMonitor': '.drift',
+}
+
+if TYPE_CHECKING:  # static analysers and IDEs see the eager imports
+    from .data import DataLoader, load_split, sample_stratified, DEFAULT_TARGET
+    from .preprocess import NaNRowRemover, NaNMeanFiller
+    from .features import BaseFeature, BMICalculator, GenderEncoder, AgeSquared
+    from .model import DiabetesModel, register_backend
+    from .cache import PredictionCache
+    from .pipeline import Pipeline
+    from .validation import CrossValidator
+    from .profiling import StageProfiler
+    from .drift import DriftMonitor
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value  # cache: later lookups skip __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
-# Import from models module
-from .model import DiabetesModel  # ← CHANGED: .models → .model
 
 # Define what gets exported with "from your_library import *"
 __all__ = [
     # Data loading
     'DataLoader',
     'load_split',
+    'sample_stratified',
     'DEFAULT_TARGET',
     
     # Preprocessing
@@ -39,6 +95,20 @@ __all__ = [
     
     # Models
     'DiabetesModel',
+    'register_backend',
+    'PredictionCache',
+
+    # Pipeline
+    'Pipeline',
+
+    # Validation
+    'CrossValidator',
+
+    # Profiling
+    'StageProfiler',
+
+    # Drift monitoring
+    'DriftMonitor',
 ]
 
 # Version info (optional but nice to have)
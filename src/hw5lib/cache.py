@@ -0,0 +1,144 @@
+"""Bounded LRU/TTL cache for model predictions."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+
+class PredictionCache:
+    """
+    Caches predicted probabilities per encounter.
+
+    Rows are keyed by a hash of their ordered feature vector plus the model
+    version, so retraining a model never serves stale predictions. The cache
+    holds at most maxsize rows (least recently used rows are evicted first) and,
+    if ttl is given, entries expire ttl seconds after they were stored.
+    The cache can be shared between threads.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 100_000,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the prediction cache.
+
+        Args:
+            maxsize: Maximum number of cached rows
+            ttl: Optional time-to-live in seconds for each entry
+            clock: Time source (override for testing)
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[float, np.ndarray]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of looked-up rows served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate and current size
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'size': len(self._entries),
+        }
+
+    def clear(self) -> None:
+        """Drop all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @staticmethod
+    def hash_rows(X: pd.DataFrame) -> np.ndarray:
+        """
+        Hash each row of a feature frame (column order matters, index does not).
+
+        Args:
+            X: Feature dataframe with columns in model order
+
+        Returns:
+            uint64 array with one hash per row
+        """
+        return pd.util.hash_pandas_object(X, index=False).to_numpy()
+
+    def predict(
+        self,
+        X: pd.DataFrame,
+        model_version: str,
+        predict_fn: Callable[[pd.DataFrame], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Return predictions for X, calling predict_fn only on uncached rows.
+
+        Args:
+            X: Feature dataframe with columns in model order
+            model_version: Version token of the model producing the predictions
+            predict_fn: Function mapping a feature frame to a 2D probability array
+
+        Returns:
+            2D array of predictions aligned with the rows of X
+        """
+        hashes = self.hash_rows(X)
+        keys = [(model_version, h) for h in hashes.tolist()]
+        now = self._clock()
+
+        rows = [None] * len(keys)
+        miss_positions = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and (self.ttl is None or entry[0] > now):
+                    self._entries.move_to_end(key)
+                    rows[i] = entry[1]
+                else:
+                    miss_positions.append(i)
+
+            self.hits += len(keys) - len(miss_positions)
+            self.misses += len(miss_positions)
+
+        if miss_positions:
+            miss_positions = np.asarray(miss_positions)
+            # Score each distinct missing encounter once
+            _, first, inverse = np.unique(hashes[miss_positions], return_index=True, return_inverse=True)
+            scored = np.asarray(predict_fn(X.iloc[miss_positions[first]]))
+
+            expires_at = now + self.ttl if self.ttl is not None else float('inf')
+            with self._lock:
+                for j, pos in enumerate(miss_positions[first].tolist()):
+                    self._entries[keys[pos]] = (expires_at, scored[j])
+                    self._entries.move_to_end(keys[pos])
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+            for pos, j in zip(miss_positions.tolist(), inverse.ravel().tolist()):
+                rows[pos] = scored[j]
+
+        if not rows:
+            return np.empty((0, 0))
+        return np.vstack(rows)
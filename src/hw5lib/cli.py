@@ -0,0 +1,210 @@
+"""
+Streaming batch-scoring command line tool.
+
+Reads an input CSV of any size in chunks, runs each chunk through a saved
+Pipeline (preprocessing, features and DiabetesModel) in a process pool, and
+writes the predictions in input order to CSV or Parquet. At most
+`max_in_flight` chunks are read but not yet written, so memory stays bounded
+and reading pauses while the workers catch up (backpressure).
+
+Run with:
+    hw5lib-score --pipeline model.pkl --input patients.csv --output predictions.parquet
+
+Output columns: row (0-based input row number), any --keep columns, prediction
+(positive-class probability; empty/NaN for rows dropped by a step).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, TextIO, Union
+
+import pandas as pd
+
+from .pipeline import Pipeline
+from .serving import _init_worker, _score_frame_in_worker
+
+# Columns the scorer writes itself; --keep columns may not reuse these names
+OUTPUT_COLUMNS = ("row", "prediction")
+
+
+class _InlineExecutor(Executor):
+    """Runs submitted work immediately in the calling process (workers=0)."""
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
+
+
+class _PredictionWriter:
+    """Appends prediction chunks to a CSV or Parquet file."""
+
+    def __init__(self, path: Path, output_format: str):
+        self.path = path
+        self.output_format = output_format
+        self._parquet_writer = None
+        self._wrote_header = False
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if self.output_format == "csv":
+            frame.to_csv(self.path, mode="a" if self._wrote_header else "w",
+                         header=not self._wrote_header, index=False)
+            self._wrote_header = True
+            return
+
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Parquet output requires pyarrow: pip install 'hw5lib[parquet]'") from exc
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+        elif table.schema != self._parquet_writer.schema:
+            # e.g. an int column that has missing values in a later chunk
+            table = table.cast(self._parquet_writer.schema)
+        self._parquet_writer.write_table(table)
+
+    def close(self) -> None:
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def score_csv(
+    pipeline_path: Union[str, Path],
+    input_path: Union[str, Path],
+    output_path: Union[str, Path],
+    chunk_rows: int = 50_000,
+    workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    keep_columns: Optional[List[str]] = None,
+    output_format: Optional[str] = None,
+    progress: Optional[TextIO] = sys.stderr
+) -> Dict[str, Any]:
+    """
+    Score a CSV file chunk by chunk with a saved pipeline.
+
+    Args:
+        pipeline_path: Pipeline written with Pipeline.save() (with a trained DiabetesModel)
+        input_path: Input CSV with the raw feature columns
+        output_path: Destination file (.csv or .parquet)
+        chunk_rows: Rows per chunk sent to a worker
+        workers: Number of worker processes (None uses all cores, 0 scores in-process)
+        max_in_flight: Chunks read but not yet written (default: 2 per worker)
+        keep_columns: Input columns copied to the output, e.g. an encounter id
+                      (not "row" or "prediction")
+        output_format: 'csv' or 'parquet' (default: from the output suffix)
+        progress: Stream for progress lines (None to disable)
+
+    Returns:
+        Dictionary with rows, chunks, seconds and rows_per_second
+    """
+    output_path = Path(output_path)
+    output_format = output_format or ("parquet" if output_path.suffix in (".parquet", ".pq") else "csv")
+    if output_format not in ("csv", "parquet"):
+        raise ValueError(f"Unknown output format '{output_format}'. Use 'csv' or 'parquet'")
+    keep_columns = list(keep_columns or [])
+    clashing = [col for col in keep_columns if col in OUTPUT_COLUMNS]
+    if clashing:
+        raise ValueError(f"Columns to keep clash with generated output columns {list(OUTPUT_COLUMNS)}: {clashing}")
+
+    pipeline = Pipeline.load(pipeline_path)
+    if pipeline.model is None:
+        raise ValueError("The saved pipeline has no model; cannot score")
+
+    if workers == 0:
+        _init_worker(str(pipeline_path))
+        executor: Executor = _InlineExecutor()
+        max_in_flight = max_in_flight or 1
+    else:
+        workers = workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(str(pipeline_path),))
+        max_in_flight = max_in_flight or 2 * workers
+
+    writer = _PredictionWriter(output_path, output_format)
+    pending: Deque[tuple] = deque()
+    started = time.perf_counter()
+    n_rows = n_chunks = 0
+
+    def write_oldest() -> None:
+        nonlocal n_rows, n_chunks
+        chunk, future = pending.popleft()
+        out = chunk[keep_columns].copy()
+        out.insert(0, "row", chunk.index)
+        out["prediction"] = future.result()
+        writer.write(out)
+        n_rows += len(out)
+        n_chunks += 1
+        if progress is not None:
+            elapsed = time.perf_counter() - started
+            progress.write(f"\r{n_rows:,} rows scored, {n_rows / max(elapsed, 1e-9):,.0f} rows/s")
+            progress.flush()
+
+    try:
+        for chunk in pd.read_csv(input_path, chunksize=chunk_rows):
+            missing = set(keep_columns) - set(chunk.columns)
+            if missing:
+                raise ValueError(f"Columns to keep not found in input: {missing}")
+            # Backpressure: wait for the oldest chunk before reading more
+            while len(pending) >= max_in_flight:
+                write_oldest()
+            pending.append((chunk, executor.submit(_score_frame_in_worker, chunk)))
+        while pending:
+            write_oldest()
+    finally:
+        writer.close()
+        executor.shutdown(cancel_futures=True)
+
+    seconds = time.perf_counter() - started
+    if progress is not None:
+        progress.write("\n")
+    return {
+        'rows': n_rows,
+        'chunks': n_chunks,
+        'seconds': seconds,
+        'rows_per_second': n_rows / seconds if seconds > 0 else float('nan'),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Score a CSV file with a saved hw5lib Pipeline.")
+    parser.add_argument("--pipeline", required=True, help="Path to a pipeline written with Pipeline.save()")
+    parser.add_argument("--input", required=True, help="Input CSV file")
+    parser.add_argument("--output", required=True, help="Output file (.csv or .parquet)")
+    parser.add_argument("--format", choices=["csv", "parquet"], default=None,
+                        help="Output format (default: from the output file suffix)")
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: all cores, 0 scores in-process)")
+    parser.add_argument("--max-in-flight", type=int, default=None,
+                        help="Chunks read but not yet written (default: 2 per worker)")
+    parser.add_argument("--keep", nargs="*", default=[], help="Input columns to copy to the output")
+    parser.add_argument("--quiet", action="store_true", help="Do not print progress")
+    args = parser.parse_args(argv)
+
+    stats = score_csv(
+        args.pipeline, args.input, args.output,
+        chunk_rows=args.chunk_rows,
+        workers=args.workers,
+        max_in_flight=args.max_in_flight,
+        keep_columns=args.keep,
+        output_format=args.format,
+        progress=None if args.quiet else sys.stderr,
+    )
+    if not args.quiet:
+        print(f"Wrote {stats['rows']:,} predictions to {args.output} in {stats['seconds']:.1f}s "
+              f"({stats['rows_per_second']:,.0f} rows/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
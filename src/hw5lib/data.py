@@ -1,8 +1,12 @@
 from __future__ import annotations
+import math
 from pathlib import Path
-from typing import Tuple
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
+
+from .frames import PANDAS_NA_VALUES, check_engine, import_polars
+from .profiling import profiled
 
 DEFAULT_TARGET = "diabetes_mellitus"
 
@@ -12,11 +16,21 @@ def load_split(
     target: str = DEFAULT_TARGET,
     test_size: float = 0.2,
     random_state: int = 42,
+    engine: str = "pandas",
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Stratified split on the target column (default: 'diabetes_mellitus').
     Returns (train_df, test_df).
+
+    engine='polars' reads the CSV with Polars' multithreaded reader and returns
+    polars DataFrames holding the same rows, in the same order, as the pandas split.
+    Polars parses floats with correct rounding while pandas' default parser can
+    be off by one ulp, so for bit-identical inputs convert a pandas frame with
+    polars.from_pandas() instead.
     """
+    if check_engine(engine) == "polars":
+        return _load_split_polars(Path(csv_path), target, test_size, random_state)
+
     df = pd.read_csv(Path(csv_path))
     if target not in df.columns:
         raise ValueError(f"Target column '{target}' not found. Available: {list(df.columns)}")
@@ -24,15 +38,172 @@ def load_split(
     if len(vc) < 2:
         raise ValueError(f"Target '{target}' has <2 classes; cannot stratify. Value counts: {vc.to_dict()}")
 
+    from sklearn.model_selection import train_test_split  # deferred: slow to import
+
     train_df, test_df = train_test_split(
         df, test_size=test_size, random_state=random_state, stratify=df[target]
     )
     return train_df.copy(), test_df.copy()
 
 
+def _load_split_polars(csv_path: Path, target: str, test_size: float, random_state: int):
+    pl = import_polars()
+    # Infer dtypes from the whole file, as pandas does, and treat the same strings as missing
+    df = pl.read_csv(csv_path, null_values=PANDAS_NA_VALUES, infer_schema_length=None)
+    if target not in df.columns:
+        raise ValueError(f"Target column '{target}' not found. Available: {list(df.columns)}")
+    vc = df[target].drop_nulls().value_counts()
+    if vc.height < 2:
+        raise ValueError(f"Target '{target}' has <2 classes; cannot stratify. Value counts: {dict(vc.iter_rows())}")
+
+    from sklearn.model_selection import train_test_split  # deferred: slow to import
+
+    # The split depends only on the row count and the labels, so splitting row
+    # positions picks exactly the rows the pandas path picks
+    train_idx, test_idx = train_test_split(
+        np.arange(df.height), test_size=test_size, random_state=random_state,
+        stratify=df[target].to_numpy()
+    )
+    return df[train_idx], df[test_idx]
+
+
+def _allocate(class_counts: Dict[Any, int], sample_size: int,
+              positive_fraction: Optional[float], positive_label: Any) -> Dict[Any, int]:
+    """Rows to draw per class: proportional to the full data, or with a fixed positive share."""
+    total = sum(class_counts.values())
+    if positive_fraction is None:
+        quotas = {c: sample_size * n / total for c, n in class_counts.items()}
+    else:
+        if positive_label not in class_counts:
+            raise ValueError(f"Positive label {positive_label!r} not found in target. Classes: {list(class_counts)}")
+        n_pos = class_counts[positive_label]
+        n_neg = total - n_pos
+        quotas = {c: sample_size * (positive_fraction if c == positive_label else
+                                    (1 - positive_fraction) * n / max(n_neg, 1))
+                  for c, n in class_counts.items()}
+
+    # Largest remainder rounding so the counts add up to sample_size
+    counts = {c: min(int(q), class_counts[c]) for c, q in quotas.items()}
+    for c in sorted(quotas, key=lambda c: quotas[c] - int(quotas[c]), reverse=True):
+        if sum(counts.values()) >= sample_size:
+            break
+        if counts[c] < class_counts[c]:
+            counts[c] += 1
+    return counts
+
+
+def sample_stratified(
+    csv_path: str | Path,
+    *,
+    sample_size: int,
+    target: str = DEFAULT_TARGET,
+    positive_fraction: Optional[float] = None,
+    positive_label: Any = 1,
+    chunk_rows: int = 100_000,
+    random_state: int = 42,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Stratified sample of a CSV that may not fit in memory, in one streaming pass.
+
+    Each row gets a uniform random key and every class keeps the rows with the
+    `sample_size` smallest keys seen so far (a bottom-k reservoir), so memory is
+    bounded by one chunk plus `sample_size` rows per class. At the end the
+    exact class counts decide how many rows each class contributes; the rows
+    with the smallest keys of a class are a uniform sample without replacement.
+
+    Args:
+        csv_path: CSV file to read in chunks
+        sample_size: Rows in the returned sample (fewer if a class has fewer
+                     rows than its share)
+        target: Target column to stratify on (rows with a missing target are skipped)
+        positive_fraction: Share of the sample taken from the positive class, e.g.
+                           0.5 to oversample rare positives (default: the class
+                           shares of the full file)
+        positive_label: Target value of the positive class
+        chunk_rows: Rows read per chunk
+        random_state: Seed for the reservoir keys
+
+    Returns:
+        (sample_df, stats). The sample keeps the input row numbers as index, in
+        file order. stats holds full-file statistics: rows, class_counts,
+        sample_counts, sampling_rates (weight rows by 1 / rate to undo
+        oversampling), means and missing_counts for every numeric column.
+    """
+    if sample_size < 1:
+        raise ValueError("sample_size must be at least 1")
+    if positive_fraction is not None and not 0 < positive_fraction < 1:
+        raise ValueError("positive_fraction must be between 0 and 1")
+
+    rng = np.random.default_rng(random_state)
+    reservoirs: Dict[Any, Tuple[np.ndarray, pd.DataFrame]] = {}
+    class_counts: Dict[Any, int] = {}
+    sums: Dict[str, list] = {}
+    counts: Dict[str, int] = {}
+    missing_counts: Dict[str, int] = {}
+    numeric_columns: Optional[set] = None
+    n_rows = 0
+
+    for chunk in pd.read_csv(Path(csv_path), chunksize=chunk_rows):
+        if target not in chunk.columns:
+            raise ValueError(f"Target column '{target}' not found. Available: {list(chunk.columns)}")
+        n_rows += len(chunk)
+
+        # Full-data statistics for the imputers (partial sums are added exactly at the end)
+        numeric = {c for c in chunk.columns if pd.api.types.is_numeric_dtype(chunk[c])}
+        numeric_columns = numeric if numeric_columns is None else numeric_columns & numeric
+        for col, n_missing in chunk.isna().sum().items():
+            missing_counts[col] = missing_counts.get(col, 0) + int(n_missing)
+        for col in numeric:
+            sums.setdefault(col, []).append(float(chunk[col].sum()))
+            counts[col] = counts.get(col, 0) + int(chunk[col].count())
+
+        keys = rng.random(len(chunk))
+        labels = chunk[target]
+        for label, positions in labels.groupby(labels, sort=False).indices.items():
+            label = label.item() if isinstance(label, np.generic) else label
+            class_counts[label] = class_counts.get(label, 0) + len(positions)
+            res_keys, res_rows = reservoirs.get(label, (np.empty(0), chunk.iloc[:0]))
+            if len(res_keys) >= sample_size:
+                # Only rows that beat the current k-th smallest key can enter
+                positions = positions[keys[positions] < res_keys.max()]
+                if not len(positions):
+                    continue
+            cand_keys = np.concatenate([res_keys, keys[positions]])
+            cand_rows = pd.concat([res_rows, chunk.iloc[positions]])
+            if len(cand_keys) > sample_size:
+                keep = np.argpartition(cand_keys, sample_size - 1)[:sample_size]
+                cand_keys, cand_rows = cand_keys[keep], cand_rows.iloc[keep]
+            reservoirs[label] = (cand_keys, cand_rows)
+
+    if len(class_counts) < 2:
+        raise ValueError(f"Target '{target}' has <2 classes; cannot stratify. Value counts: {class_counts}")
+
+    sample_counts = _allocate(class_counts, sample_size, positive_fraction, positive_label)
+    parts = []
+    for label, (res_keys, res_rows) in reservoirs.items():
+        n = sample_counts[label]
+        parts.append(res_rows.iloc[np.argsort(res_keys, kind="stable")[:n]])
+    sample = pd.concat(parts).sort_index()
+
+    stats = {
+        'rows': n_rows,
+        'class_counts': class_counts,
+        'sample_counts': sample_counts,
+        'sampling_rates': {c: sample_counts[c] / class_counts[c] for c in class_counts},
+        'means': {c: math.fsum(sums[c]) / counts[c] if counts[c] else np.nan
+                  for c in sums if c in numeric_columns},
+        'missing_counts': missing_counts,
+    }
+    return sample, stats
+
+
 class DataLoader:
     """
     Always performs a stratified train/test split on the target column.
+
+    Pass engine='polars' to get polars DataFrames; the preprocessing, feature
+    and model classes accept them (and LazyFrames) directly. For files larger
+    than memory use load_sample(), which streams the file once.
     """
     def __init__(
         self,
@@ -41,16 +212,44 @@ class DataLoader:
         target: str = DEFAULT_TARGET,
         test_size: float = 0.2,
         random_state: int = 42,
+        engine: str = "pandas",
     ):
         self.csv_path = Path(csv_path)
         self.target = target
         self.test_size = test_size
         self.random_state = random_state
+        self.engine = check_engine(engine)
 
+    @profiled
     def load(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
         return load_split(
             self.csv_path,
             target=self.target,
             test_size=self.test_size,
             random_state=self.random_state,
+            engine=self.engine,
+        )
+
+    @profiled
+    def load_sample(
+        self,
+        sample_size: int,
+        *,
+        positive_fraction: Optional[float] = None,
+        chunk_rows: int = 100_000,
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Stream the CSV once and return a stratified training sample plus
+        full-file statistics (see sample_stratified()).
+
+        Fit imputers on the full data with, e.g.,
+        NaNMeanFiller.from_means(stats['means'], columns).
+        """
+        return sample_stratified(
+            self.csv_path,
+            sample_size=sample_size,
+            target=self.target,
+            positive_fraction=positive_fraction,
+            chunk_rows=chunk_rows,
+            random_state=self.random_state,
         )
@@ -0,0 +1,185 @@
+"""Data-drift monitoring of scoring batches against training statistics."""
+
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+from .profiling import profiled
+
+
+class DriftMonitor:
+    """
+    Compares scoring batches with compact per-column training statistics.
+
+    At fit time each numeric column is summarized by quantile bin edges and the
+    share of training rows per bin, and each categorical column by its category
+    frequencies; numeric columns with at most `n_bins` distinct values (e.g.
+    0/1 flags), whose quantile edges would collapse into one bin, are
+    summarized by value frequencies like categories. Missingness rates are
+    kept for all columns. For a new batch the
+    Population Stability Index (PSI) and a binned Kolmogorov-Smirnov (KS)
+    statistic are computed for all numeric columns in one vectorized pass.
+    A column is flagged when its PSI or its change in missing rate is too large.
+    """
+
+    def __init__(
+        self,
+        columns: Optional[List[str]] = None,
+        n_bins: int = 10,
+        max_categories: int = 50,
+        psi_threshold: float = 0.2,
+        missing_rate_threshold: float = 0.1,
+        eps: float = 1e-4
+    ):
+        """
+        Initialize the drift monitor.
+
+        Args:
+            columns: Columns to monitor (default: every column seen at fit time)
+            n_bins: Number of quantile bins per numeric column; numeric columns
+                    with at most this many distinct values are binned by value
+            max_categories: Most frequent categories kept per categorical column;
+                            the rest are pooled into one "other" bucket
+            psi_threshold: PSI above which a column is flagged as drifted
+                           (0.1-0.2 is commonly read as moderate, >0.2 as major drift)
+            missing_rate_threshold: Absolute change in a column's missing rate
+                                    above which it is flagged as drifted
+            eps: Floor applied to bin shares so empty bins do not give infinite PSI
+        """
+        self.columns = columns
+        self.n_bins = n_bins
+        self.max_categories = max_categories
+        self.psi_threshold = psi_threshold
+        self.missing_rate_threshold = missing_rate_threshold
+        self.eps = eps
+
+        # Learned statistics (sklearn convention: _ suffix)
+        self.numeric_columns_: List[str] = []
+        self.discrete_columns_: List[str] = []     # low-cardinality numeric, binned by value
+        self.categorical_columns_: List[str] = []
+        self.edges_ = np.empty((0, n_bins - 1))           # interior quantile edges per numeric column
+        self.bin_shares_ = np.empty((0, n_bins))          # training share per bin (non-missing rows)
+        self.category_shares_: Dict[str, pd.Series] = {}  # includes an "other" bucket (discrete too)
+        self.missing_rates_: Dict[str, float] = {}
+        self.is_fitted = False
+
+    def _bin_shares(self, X: np.ndarray, chunk_rows: int = 65_536) -> np.ndarray:
+        """Share of non-missing rows per quantile bin, for every numeric column at once."""
+        n_cols = X.shape[1]
+        n_slots = self.n_bins + 1  # last slot collects missing values
+        counts = np.zeros(n_cols * n_slots, dtype=np.int64)
+        offsets = np.arange(n_cols) * n_slots
+        for start in range(0, len(X), chunk_rows):
+            block = X[start:start + chunk_rows]
+            bins = (block[:, :, None] >= self.edges_[None, :, :]).sum(axis=2)
+            bins[np.isnan(block)] = self.n_bins
+            counts += np.bincount((bins + offsets).ravel(), minlength=n_cols * n_slots)
+
+        counts = counts.reshape(n_cols, n_slots)[:, :self.n_bins]
+        totals = counts.sum(axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return counts / totals
+
+    @profiled
+    def fit(self, df: pd.DataFrame) -> 'DriftMonitor':
+        """
+        Learn per-column training statistics.
+
+        Args:
+            df: Training dataframe
+
+        Returns:
+            self for method chaining
+        """
+        columns = self.columns if self.columns is not None else list(df.columns)
+        missing_cols = set(columns) - set(df.columns)
+        if missing_cols:
+            raise ValueError(f"Columns not found in dataframe: {missing_cols}")
+
+        numeric = [c for c in columns if pd.api.types.is_numeric_dtype(df[c])]
+        self.discrete_columns_ = [c for c in numeric if df[c].nunique() <= self.n_bins]
+        self.numeric_columns_ = [c for c in numeric if c not in self.discrete_columns_]
+        self.categorical_columns_ = [c for c in columns if c not in numeric]
+
+        X = df[self.numeric_columns_].to_numpy(dtype=np.float64)
+        quantiles = np.linspace(0, 1, self.n_bins + 1)[1:-1]
+        if len(X):
+            edges = np.nanquantile(X, quantiles, axis=0).T if len(quantiles) else np.empty((X.shape[1], 0))
+            # Repeated edges (heavy ties) would only create empty bins: move them past every value
+            repeated = np.zeros(edges.shape, dtype=bool)
+            repeated[:, 1:] = edges[:, 1:] == edges[:, :-1]
+            edges[repeated] = np.inf
+            self.edges_ = np.sort(edges, axis=1)
+        self.bin_shares_ = self._bin_shares(X)
+
+        self.missing_rates_ = df[columns].isna().mean().to_dict()
+        self.category_shares_ = {}
+        for col in self.discrete_columns_:
+            shares = df[col].value_counts(normalize=True, dropna=True).sort_index()
+            shares.loc["__other__"] = 0.0
+            self.category_shares_[col] = shares
+        for col in self.categorical_columns_:
+            shares = df[col].value_counts(normalize=True, dropna=True)
+            top = shares.iloc[:self.max_categories]
+            top.loc["__other__"] = max(0.0, 1.0 - top.sum())
+            self.category_shares_[col] = top
+
+        self.is_fitted = True
+        return self
+
+    @profiled
+    def compute_drift(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Measure drift of a scoring batch for every monitored column.
+
+        Args:
+            df: Scoring batch with the monitored columns
+
+        Returns:
+            DataFrame indexed by column with kind, psi, ks (numeric and discrete),
+            training and batch missing rates, and a drifted flag (PSI or
+            missing-rate change above its threshold)
+        """
+        if not self.is_fitted:
+            raise RuntimeError("Monitor must be fitted before computing drift. Call fit() first.")
+
+        by_value = self.discrete_columns_ + self.categorical_columns_
+        columns = self.numeric_columns_ + by_value
+        missing_cols = set(columns) - set(df.columns)
+        if missing_cols:
+            raise ValueError(f"Columns not found in dataframe: {missing_cols}")
+
+        # Numeric columns: one vectorized pass over the batch
+        shares = self._bin_shares(df[self.numeric_columns_].to_numpy(dtype=np.float64))
+        expected = np.clip(self.bin_shares_, self.eps, None)
+        actual = np.clip(shares, self.eps, None)
+        psi = ((actual - expected) * np.log(actual / expected)).sum(axis=1)
+        ks = np.abs(np.cumsum(self.bin_shares_, axis=1) - np.cumsum(shares, axis=1)).max(axis=1, initial=0)
+
+        # Discrete and categorical columns: compare value frequencies
+        cat_psi, cat_ks = [], []
+        for col in by_value:
+            reference = self.category_shares_[col]
+            shares = df[col].value_counts(normalize=True, dropna=True)
+            known = shares.reindex(reference.index[:-1], fill_value=0.0)
+            batch = pd.concat([known, pd.Series({"__other__": max(0.0, 1.0 - known.sum())})])
+            e = np.clip(reference.to_numpy(), self.eps, None)
+            a = np.clip(batch.to_numpy(), self.eps, None)
+            cat_psi.append(float(((a - e) * np.log(a / e)).sum()) if shares.size else np.nan)
+            if col in self.categorical_columns_:
+                cat_ks.append(np.nan)
+            else:  # discrete values are ordered
+                cat_ks.append(float(np.abs(np.cumsum(reference.to_numpy()[:-1]) - np.cumsum(known.to_numpy())).max(initial=0)))
+
+        batch_missing = df[columns].isna().mean()
+        result = pd.DataFrame({
+            'kind': (['numeric'] * len(self.numeric_columns_) + ['discrete'] * len(self.discrete_columns_)
+                     + ['categorical'] * len(self.categorical_columns_)),
+            'psi': np.r_[psi, cat_psi],
+            'ks': np.r_[ks, cat_ks],
+            'missing_rate_train': [self.missing_rates_[c] for c in columns],
+            'missing_rate_batch': batch_missing.to_numpy(),
+        }, index=pd.Index(columns, name='column'))
+        missing_change = (result['missing_rate_batch'] - result['missing_rate_train']).abs()
+        result['drifted'] = (result['psi'] > self.psi_threshold) | (missing_change > self.missing_rate_threshold)
+        return result
@@ -1,13 +1,19 @@
 """Feature engineering classes for creating new features from data."""
 
 from abc import ABC, abstractmethod
+import numpy as np
 import pandas as pd
 
+from .frames import collect, column_names, import_polars, is_polars
+from .profiling import profiled
+
 
 class BaseFeature(ABC):
     """
     Abstract base class for feature transformers.
     All feature classes must inherit from this and implement fit() and transform().
+    The built-in features also accept polars DataFrames and LazyFrames and
+    return the same kind of frame.
     """
     
     def __init__(self):
@@ -77,6 +83,7 @@ class BMICalculator(BaseFeature):
         self.weight_col = weight_col
         self.output_col = output_col
     
+    @profiled
     def fit(self, df: pd.DataFrame) -> 'BMICalculator':
         """
         Validate that required columns exist.
@@ -88,13 +95,14 @@ class BMICalculator(BaseFeature):
             self
         """
         required_cols = [self.height_col, self.weight_col]
-        missing_cols = set(required_cols) - set(df.columns)
+        missing_cols = set(required_cols) - set(column_names(df))
         if missing_cols:
             raise ValueError(f"Required columns not found: {missing_cols}")
         
         self.is_fitted = True
         return self
     
+    @profiled
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Calculate BMI and add as new column.
@@ -108,6 +116,13 @@ class BMICalculator(BaseFeature):
         if not self.is_fitted:
             raise RuntimeError("Feature must be fitted before transform. Call fit() first.")
         
+        if is_polars(df):
+            pl = import_polars()
+            # Polars divides by a scalar via its reciprocal, which can differ from pandas in
+            # the last bit, so convert with the NumPy ufunc; x * x matches NumPy's ** 2
+            height_m = np.divide(pl.col(self.height_col), 100)
+            return df.with_columns((pl.col(self.weight_col) / (height_m * height_m)).alias(self.output_col))
+
         df_transformed = df.copy()
         
         # Convert height from cm to meters and calculate BMI
@@ -136,6 +151,7 @@ class GenderEncoder(BaseFeature):
         self.output_col = output_col
         self.gender_mapping_ = {}  # Will be learned during fit
     
+    @profiled
     def fit(self, df: pd.DataFrame) -> 'GenderEncoder':
         """
         Learn unique gender values and create mapping.
@@ -146,16 +162,20 @@ class GenderEncoder(BaseFeature):
         Returns:
             self
         """
-        if self.gender_col not in df.columns:
+        if self.gender_col not in column_names(df):
             raise ValueError(f"Column '{self.gender_col}' not found")
         
         # Get unique gender values and create numeric mapping
-        unique_genders = df[self.gender_col].dropna().unique()
+        if is_polars(df):
+            unique_genders = collect(df.select(self.gender_col)).to_series().drop_nulls().unique().to_list()
+        else:
+            unique_genders = df[self.gender_col].dropna().unique()
         self.gender_mapping_ = {gender: idx for idx, gender in enumerate(sorted(unique_genders))}
         
         self.is_fitted = True
         return self
     
+    @profiled
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Apply gender encoding using learned mapping.
@@ -169,6 +189,11 @@ class GenderEncoder(BaseFeature):
         if not self.is_fitted:
             raise RuntimeError("Must call fit() first")
         
+        if is_polars(df):
+            pl = import_polars()
+            encoded = pl.col(self.gender_col).replace_strict(self.gender_mapping_, default=None, return_dtype=pl.Int64)
+            return df.with_columns(encoded.alias(self.output_col))
+
         df_transformed = df.copy()
         df_transformed[self.output_col] = df_transformed[self.gender_col].map(self.gender_mapping_)
         
@@ -193,6 +218,7 @@ class AgeSquared(BaseFeature):
         self.age_col = age_col
         self.output_col = output_col
     
+    @profiled
     def fit(self, df: pd.DataFrame) -> 'AgeSquared':
         """
         Validate that age column exists.
@@ -203,12 +229,13 @@ class AgeSquared(BaseFeature):
         Returns:
             self
         """
-        if self.age_col not in df.columns:
+        if self.age_col not in column_names(df):
             raise ValueError(f"Column '{self.age_col}' not found")
         
         self.is_fitted = True
         return self
     
+    @profiled
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Create age squared feature.
@@ -222,6 +249,10 @@ class AgeSquared(BaseFeature):
         if not self.is_fitted:
             raise RuntimeError("Must call fit() first")
         
+        if is_polars(df):
+            pl = import_polars()
+            return df.with_columns((pl.col(self.age_col) * pl.col(self.age_col)).alias(self.output_col))
+
         df_transformed = df.copy()
         df_transformed[self.output_col] = df_transformed[self.age_col] ** 2
         
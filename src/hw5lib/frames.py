@@ -0,0 +1,99 @@
+"""
+Helpers for running hw5lib stages on Polars frames as well as pandas.
+
+Polars is an optional dependency (pip install 'hw5lib[polars]') and is only
+imported when a Polars frame is loaded or passed in. Every stage that accepts
+a pandas DataFrame also accepts a polars DataFrame or LazyFrame and returns
+the same kind of frame; the values match the pandas path, with missing values
+represented as nulls (or NaN in float columns) instead of NaN only.
+"""
+
+from typing import List, Sequence
+import pandas as pd
+
+ENGINES = ("pandas", "polars")
+
+# pandas.read_csv's default missing-value markers, so both engines parse the same nulls
+PANDAS_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+
+def import_polars():
+    """Import polars, with an install hint if it is missing."""
+    try:
+        import polars
+    except ImportError as exc:
+        raise ImportError("The polars engine requires polars: pip install 'hw5lib[polars]'") from exc
+    return polars
+
+
+def check_engine(engine: str) -> str:
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}'. Available: {list(ENGINES)}")
+    return engine
+
+
+def is_polars(df) -> bool:
+    """True for a polars DataFrame or LazyFrame (checked without importing polars)."""
+    return type(df).__module__.split(".")[0] == "polars"
+
+
+def column_names(df) -> List[str]:
+    """Column names of a pandas or polars frame (resolving a LazyFrame's schema)."""
+    if is_polars(df):
+        return df.collect_schema().names()
+    return list(df.columns)
+
+
+def collect(df):
+    """Materialize a polars LazyFrame; DataFrames are returned unchanged."""
+    return df.collect() if hasattr(df, "collect") else df
+
+
+def missing_exprs(df, columns: Sequence[str]) -> list:
+    """Polars expressions flagging missing values the way pandas isna() does (null or NaN)."""
+    pl = import_polars()
+    schema = df.collect_schema()
+    exprs = []
+    for col in columns:
+        expr = pl.col(col).is_null()
+        if schema[col].is_float():
+            expr = expr | pl.col(col).is_nan()
+        exprs.append(expr)
+    return exprs
+
+
+def pandas_mean(series) -> float:
+    """Mean of a polars Series computed by pandas, so both engines learn bit-identical values."""
+    return pd.Series(series.to_numpy(), copy=False).mean()
+
+
+def feature_frame(df, columns: List[str]) -> pd.DataFrame:
+    """
+    Feature matrix for an estimator.
+
+    A pandas frame is sliced as before. A polars frame is converted to a single
+    float64 matrix (nulls become NaN) and wrapped in a pandas DataFrame without
+    copying it again, so sklearn still sees the feature names.
+
+    Args:
+        df: pandas DataFrame, polars DataFrame or polars LazyFrame
+        columns: Feature columns in model order
+
+    Returns:
+        DataFrame with the feature columns
+    """
+    if not is_polars(df):
+        return df[columns]
+    pl = import_polars()
+    matrix = collect(df.select(pl.col(columns).cast(pl.Float64))).to_numpy(order="fortran")
+    return pd.DataFrame(matrix, columns=columns, copy=False)
+
+
+def target_values(df, column: str) -> pd.Series:
+    """Target column as a pandas Series (positionally indexed for polars input)."""
+    if not is_polars(df):
+        return df[column]
+    return pd.Series(collect(df.select(column)).to_series().to_numpy(), name=column, copy=False)
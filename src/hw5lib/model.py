@@ -1,8 +1,137 @@
 """Model classes for training and prediction."""
 
-from typing import List, Optional, Dict, Any
+import pickle
+import time
+import uuid
+import warnings
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
+
+# sklearn and joblib are imported inside the functions that use them, so that
+# `import hw5lib` stays fast for callers that never train or score a model
+
+from .cache import PredictionCache
+from .frames import column_names, feature_frame, target_values
+from .profiling import profiled
+
+
+class EstimatorBackend(NamedTuple):
+    """Description of an estimator that DiabetesModel can wrap."""
+    factory: Callable[..., Any]
+    handles_missing: bool = False
+    importance: Optional[Callable[[Any], np.ndarray]] = None
+    defaults: Dict[str, Any] = {}
+    n_estimators_param: Optional[str] = None
+
+
+# Registry of estimator backends, keyed by the name passed to DiabetesModel(backend=...)
+ESTIMATOR_BACKENDS: Dict[str, EstimatorBackend] = {}
+
+
+def register_backend(
+    name: str,
+    factory: Callable[..., Any],
+    handles_missing: bool = False,
+    importance: Optional[Callable[[Any], np.ndarray]] = None,
+    defaults: Optional[Dict[str, Any]] = None,
+    n_estimators_param: Optional[str] = None
+) -> None:
+    """
+    Register an estimator backend for DiabetesModel.
+    
+    Args:
+        name: Backend name used in DiabetesModel(backend=name)
+        factory: Callable taking hyperparameters as keyword arguments and
+                 returning an unfitted estimator with fit() and predict_proba()
+        handles_missing: Whether the estimator accepts NaN features natively
+                         (so imputation steps such as NaNMeanFiller can be skipped)
+        importance: Optional function mapping the fitted estimator to one
+                    importance score per feature
+        defaults: Default hyperparameters, overridden by user hyperparameters
+        n_estimators_param: Name of the hyperparameter counting trees/iterations
+                            that can be grown incrementally with warm_start
+                            (used by DiabetesModel.train_with_budget)
+    """
+    ESTIMATOR_BACKENDS[name] = EstimatorBackend(
+        factory, handles_missing, importance, defaults or {}, n_estimators_param
+    )
+
+
+def _impurity_importance(estimator: Any) -> np.ndarray:
+    return estimator.feature_importances_
+
+
+def _coefficient_importance(estimator: Any) -> np.ndarray:
+    # Absolute coefficients: only comparable when features share a scale
+    return np.abs(estimator.coef_).mean(axis=0)
+
+
+def _random_forest(**params: Any) -> Any:
+    from sklearn.ensemble import RandomForestClassifier
+    return RandomForestClassifier(**params)
+
+
+def _hist_gbm(**params: Any) -> Any:
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    return HistGradientBoostingClassifier(**params)
+
+
+def _logistic(**params: Any) -> Any:
+    from sklearn.linear_model import LogisticRegression
+    return LogisticRegression(**params)
+
+
+register_backend(
+    "random_forest",
+    _random_forest,
+    importance=_impurity_importance,
+    n_estimators_param="n_estimators",
+)
+register_backend(
+    "hist_gbm",
+    _hist_gbm,
+    handles_missing=True,
+    n_estimators_param="max_iter",
+)
+register_backend(
+    "logistic",
+    _logistic,
+    importance=_coefficient_importance,
+    defaults={"max_iter": 1000},
+)
+
+
+def _permutation_scores(
+    estimator: Any,
+    X: np.ndarray,
+    y: np.ndarray,
+    columns: List[str],
+    feature_indices: List[int],
+    seeds: List[np.random.SeedSequence],
+    n_repeats: int
+) -> List[np.ndarray]:
+    """
+    Score the estimator with each feature in feature_indices permuted in turn.
+    One writable buffer is shared by all features of the chunk: a column is
+    shuffled in place, scored, and restored before the next feature.
+    """
+    from sklearn.metrics import roc_auc_score
+
+    buffer = np.array(X, dtype=np.float64, order='F')
+    frame = pd.DataFrame(buffer, columns=columns, copy=False)  # view on buffer
+    
+    results = []
+    for j, seed in zip(feature_indices, seeds):
+        rng = np.random.default_rng(seed)
+        original = X[:, j]
+        scores = np.empty(n_repeats)
+        for r in range(n_repeats):
+            buffer[:, j] = original[rng.permutation(len(original))]
+            scores[r] = roc_auc_score(y, estimator.predict_proba(frame)[:, 1])
+        buffer[:, j] = original
+        results.append(scores)
+    return results
 
 
 class DiabetesModel:
@@ -15,7 +144,9 @@ class DiabetesModel:
         self,
         feature_columns: List[str],
         target_column: str,
-        hyperparameters: Optional[Dict[str, Any]] = None
+        hyperparameters: Optional[Dict[str, Any]] = None,
+        model_version: Optional[str] = None,
+        backend: str = "random_forest"
     ):
         """
         Initialize the diabetes prediction model.
@@ -25,51 +156,284 @@ class DiabetesModel:
             target_column: Name of the target column
             hyperparameters: Optional dictionary of model hyperparameters
                            (e.g., {'n_estimators': 100, 'max_depth': 5})
+            model_version: Optional fixed version token; by default a new token
+                           is generated every time the model is trained
+            backend: Name of a registered estimator backend
+                     ("random_forest", "hist_gbm" or "logistic")
         """
+        if backend not in ESTIMATOR_BACKENDS:
+            raise ValueError(
+                f"Unknown backend '{backend}'. Available: {sorted(ESTIMATOR_BACKENDS)}"
+            )
+        
         # Private attributes (convention: prefix with _)
         self._feature_columns = feature_columns
         self._target_column = target_column
         self._hyperparameters = hyperparameters if hyperparameters is not None else {}
+        self._backend_name = backend
         
-        # Public attribute: the sklearn model
-        # Using RandomForestClassifier, but could be LogisticRegression, etc.
-        self.model = RandomForestClassifier(**self._hyperparameters)
+        # Public attribute: the sklearn model built by the selected backend
+        self.model = self._backend.factory(**{**self._backend.defaults, **self._hyperparameters})
         
         # Track if model has been trained
         self._is_trained = False
+
+        # Version token used to key cached predictions
+        self._fixed_version = model_version
+        self._model_version = model_version
+        
+        # Report of the last train_with_budget() run
+        self.training_report_ = None
     
+    @profiled
     def train(self, df: pd.DataFrame) -> None:
         """
         Train the model on the provided dataframe.
         
         Args:
             df: Training dataframe containing both features and target
+                (pandas, or a polars DataFrame/LazyFrame)
             
         Returns:
             None
         """
         # Validate that required columns exist
-        missing_features = set(self._feature_columns) - set(df.columns)
+        missing_features = set(self._feature_columns) - set(column_names(df))
         if missing_features:
             raise ValueError(f"Missing feature columns: {missing_features}")
         
-        if self._target_column not in df.columns:
+        if self._target_column not in column_names(df):
             raise ValueError(f"Target column '{self._target_column}' not found")
         
         # Extract features (X) and target (y)
-        X = df[self._feature_columns]
-        y = df[self._target_column]
+        X = feature_frame(df, self._feature_columns)
+        y = target_values(df, self._target_column)
         
         # Fit the model
         self.model.fit(X, y)
         self._is_trained = True
+        self._model_version = self._fixed_version or uuid.uuid4().hex
+        self.training_report_ = None
+    
+    @profiled
+    def train_with_budget(
+        self,
+        df: pd.DataFrame,
+        time_budget_s: Optional[float] = None,
+        memory_budget_mb: Optional[float] = None,
+        pilot_rows: int = 2000,
+        pilot_estimators: int = 5,
+        min_estimators: int = 10,
+        oob_tol: float = 1e-3,
+        random_state: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Train within a wall-clock and/or memory budget.
+        
+        A small pilot fit estimates the time and model size per tree (or
+        boosting iteration) per row. The plan keeps all rows and lowers the
+        number of trees first; if even min_estimators trees do not fit, rows
+        are subsampled. Trees are then grown incrementally with warm_start,
+        stopping early when the next increment would exceed the time budget,
+        when a boosting backend's own early stopping ends before the requested
+        iterations or, for bagged forests, when the out-of-bag AUC stops
+        improving by oob_tol. The report counts the trees/iterations fitted.
+        Backends without an n_estimators_param (e.g. logistic) only subsample rows.
+        
+        Args:
+            df: Training dataframe containing both features and target
+            time_budget_s: Wall-clock budget in seconds (includes the pilot fit)
+            memory_budget_mb: Budget in MB for the fitted model plus training data
+            pilot_rows: Number of rows used for the pilot fit
+            pilot_estimators: Number of trees/iterations in the pilot fit
+            min_estimators: Fewest trees to keep before subsampling rows instead
+            oob_tol: Minimum out-of-bag AUC gain per increment to keep growing
+            random_state: Seed for the pilot and row subsamples
+            
+        Returns:
+            Report of what was trained (also stored as training_report_)
+        """
+        if time_budget_s is None and memory_budget_mb is None:
+            raise ValueError("Provide time_budget_s and/or memory_budget_mb")
+        
+        missing_features = set(self._feature_columns) - set(column_names(df))
+        if missing_features:
+            raise ValueError(f"Missing feature columns: {missing_features}")
+        
+        if self._target_column not in column_names(df):
+            raise ValueError(f"Target column '{self._target_column}' not found")
+        
+        from sklearn.base import clone
+        from sklearn.metrics import roc_auc_score
+
+        started = time.perf_counter()
+        rng = np.random.default_rng(random_state)
+        X = feature_frame(df, self._feature_columns)
+        y = target_values(df, self._target_column)
+        total_rows = len(X)
+        units_param = self._backend.n_estimators_param
+        # Fresh estimator from the configured hyperparameters (not a previous budgeted fit)
+        configured = self._backend.factory(**{**self._backend.defaults, **self._hyperparameters})
+        target_units = configured.get_params()[units_param] if units_param else 1
+        
+        # Pilot fit on a small sample to estimate cost per unit (tree) per row
+        pilot_n = min(total_rows, pilot_rows)
+        pilot_idx = rng.choice(total_rows, size=pilot_n, replace=False)
+        pilot = clone(configured)
+        pilot_units = min(pilot_estimators, target_units) if units_param else 1
+        if units_param:
+            pilot.set_params(**{units_param: pilot_units})
+        pilot_start = time.perf_counter()
+        pilot.fit(X.iloc[pilot_idx], y.iloc[pilot_idx])
+        pilot_seconds = time.perf_counter() - pilot_start
+        seconds_per_unit_row = pilot_seconds / (pilot_units * pilot_n)
+        bytes_per_unit_row = len(pickle.dumps(pilot)) / (pilot_units * pilot_n)
+        data_bytes_per_row = 8 * len(self._feature_columns)
+        
+        # Largest units*rows product allowed by each budget
+        remaining_s = None
+        if time_budget_s is not None:
+            remaining_s = max(time_budget_s - (time.perf_counter() - started), 0.0)
+        memory_bytes = memory_budget_mb * 2**20 if memory_budget_mb is not None else None
+        
+        def max_units(rows: int) -> float:
+            limits = [float(target_units)]
+            if remaining_s is not None:
+                limits.append(remaining_s / (seconds_per_unit_row * rows))
+            if memory_bytes is not None:
+                limits.append((memory_bytes / rows - data_bytes_per_row) / bytes_per_unit_row)
+            return min(limits)
+        
+        def max_rows(units: int) -> float:
+            limits = [float(total_rows)]
+            if remaining_s is not None:
+                limits.append(remaining_s / (seconds_per_unit_row * units))
+            if memory_bytes is not None:
+                limits.append(memory_bytes / (units * bytes_per_unit_row + data_bytes_per_row))
+            return min(limits)
+        
+        # Keep all rows if min_estimators trees fit the budget, else subsample rows
+        min_units = min(min_estimators, target_units)
+        rows = total_rows
+        if max_units(total_rows) < min_units:
+            rows = int(min(max(max_rows(min_units), pilot_n), total_rows))
+        memory_cap = target_units
+        if memory_bytes is not None:
+            memory_cap = max(min_units, min(target_units, int(
+                (memory_bytes / rows - data_bytes_per_row) / bytes_per_unit_row
+            )))
+        # Never plan more trees than the remaining time allows (but always at least one)
+        units_cap = max(1, min(memory_cap, int(max_units(rows))))
+        
+        if rows < total_rows:
+            row_idx = np.sort(rng.choice(total_rows, size=rows, replace=False))
+            X, y = X.iloc[row_idx], y.iloc[row_idx]
+        
+        stop_reason = "completed"
+        oob_auc = None
+        units = 1
+        original_params = configured.get_params()
+        self.model = configured
+        if units_param is None:
+            self.model.fit(X, y)
+        else:
+            use_oob = original_params.get("bootstrap", False) and "oob_score" in original_params
+            self.model.set_params(warm_start=True, **({"oob_score": True} if use_oob else {}))
+            step = max(pilot_units, int(np.ceil(target_units / 10)))
+            units = 0
+            while units < units_cap:
+                next_units = min(units_cap, units + step)
+                if time_budget_s is not None:
+                    # Shrink the increment to what the remaining time affords
+                    remaining = time_budget_s - (time.perf_counter() - started)
+                    affordable = int(remaining / (seconds_per_unit_row * rows))
+                    if affordable < 1 and units:
+                        stop_reason = "time_budget"
+                        break
+                    next_units = min(next_units, units + max(affordable, 1))
+                
+                self.model.set_params(**{units_param: next_units})
+                fit_start = time.perf_counter()
+                with warnings.catch_warnings():
+                    # Early increments leave some rows without OOB predictions
+                    warnings.simplefilter("ignore", UserWarning)
+                    self.model.fit(X, y)
+                # Boosting can stop early (n_iter_); count what was actually fitted
+                fitted_units = getattr(self.model, "n_iter_", next_units)
+                if fitted_units < next_units:
+                    units = fitted_units
+                    stop_reason = "early_stopping"
+                    break
+                # Re-estimate the rate from the increment just grown
+                seconds_per_unit_row = (time.perf_counter() - fit_start) / ((next_units - units) * rows)
+                units = next_units
+                
+                if use_oob:
+                    oob_proba = self.model.oob_decision_function_[:, 1]
+                    has_oob = ~np.isnan(oob_proba)
+                    new_auc = roc_auc_score(y.to_numpy()[has_oob], oob_proba[has_oob])
+                    improved = oob_auc is None or new_auc - oob_auc >= oob_tol
+                    oob_auc = new_auc
+                    if not improved and units < units_cap:
+                        stop_reason = "oob_plateau"
+                        break
+            
+            if stop_reason == "completed" and units < target_units:
+                stop_reason = "memory_budget" if memory_cap < target_units and units >= memory_cap else "time_budget"
+            self.model.set_params(
+                warm_start=original_params["warm_start"],
+                **({"oob_score": original_params["oob_score"]} if use_oob else {})
+            )
+        
+        self._is_trained = True
+        self._model_version = self._fixed_version or uuid.uuid4().hex
+        
+        model_bytes = len(pickle.dumps(self.model))
+        self.training_report_ = {
+            'backend': self._backend_name,
+            'n_estimators': units if units_param else None,
+            'target_n_estimators': target_units if units_param else None,
+            'n_rows': rows,
+            'total_rows': total_rows,
+            'elapsed_s': time.perf_counter() - started,
+            'pilot_s': pilot_seconds,
+            'model_size_mb': model_bytes / 2**20,
+            'estimated_memory_mb': (model_bytes + data_bytes_per_row * rows) / 2**20,
+            'oob_auc': oob_auc,
+            'stop_reason': stop_reason,
+        }
+        return self.training_report_
     
-    def predict(self, df: pd.DataFrame) -> pd.DataFrame:
+    @property
+    def _backend(self) -> EstimatorBackend:
+        # Looked up by name so pickled models don't embed the registry entry
+        return ESTIMATOR_BACKENDS[self._backend_name]
+    
+    @property
+    def backend(self) -> str:
+        """Name of the estimator backend."""
+        return self._backend_name
+    
+    @property
+    def handles_missing(self) -> bool:
+        """Whether the backend accepts NaN features, so imputation can be skipped."""
+        return self._backend.handles_missing
+    
+    @property
+    def model_version(self) -> Optional[str]:
+        """Version token of the trained model (changes on every retrain unless fixed)."""
+        return self._model_version
+    
+    @profiled
+    def predict(self, df: pd.DataFrame, cache: Optional[PredictionCache] = None) -> pd.DataFrame:
         """
         Predict probabilities for the provided dataframe.
         
         Args:
-            df: Dataframe containing feature columns
+            df: Dataframe containing feature columns (pandas or polars; polars
+                input gets a positional index)
+            cache: Optional PredictionCache; only rows not already cached for
+                   this model version are scored
             
         Returns:
             DataFrame with predicted probabilities for each class
@@ -78,41 +442,128 @@ class DiabetesModel:
             raise RuntimeError("Model must be trained before making predictions. Call train() first.")
         
         # Validate that feature columns exist
-        missing_features = set(self._feature_columns) - set(df.columns)
+        missing_features = set(self._feature_columns) - set(column_names(df))
         if missing_features:
             raise ValueError(f"Missing feature columns: {missing_features}")
         
         # Extract features
-        X = df[self._feature_columns]
+        X = feature_frame(df, self._feature_columns)
         
         # Get predicted probabilities
-        probabilities = self.model.predict_proba(X)
+        if cache is None:
+            probabilities = self.model.predict_proba(X)
+        else:
+            probabilities = cache.predict(X, self._model_version, self.model.predict_proba)
         
         # Return as DataFrame with class labels as columns
         prob_df = pd.DataFrame(
             probabilities,
             columns=[f"prob_class_{i}" for i in range(probabilities.shape[1])],
-            index=df.index
+            index=X.index
         )
         
         return prob_df
     
-    def get_feature_importance(self) -> pd.DataFrame:
+    def get_feature_importance(self, df: Optional[pd.DataFrame] = None, **permutation_kwargs: Any) -> pd.DataFrame:
         """
-        Get feature importance scores (if model supports it).
+        Get feature importance scores.
+        
+        Backends without built-in importances (e.g. hist_gbm) fall back to
+        get_permutation_importance() on the given validation data.
         
+        Args:
+            df: Validation dataframe with feature and target columns; only used
+                (and then required) for backends without built-in importances
+            **permutation_kwargs: Passed on to get_permutation_importance()
+            
         Returns:
             DataFrame with features and their importance scores
         """
         if not self._is_trained:
             raise RuntimeError("Model must be trained first")
         
-        if not hasattr(self.model, 'feature_importances_'):
-            raise AttributeError("Model does not support feature importances")
+        if self._backend.importance is None:
+            if df is None:
+                raise ValueError(
+                    f"Backend '{self._backend_name}' has no built-in feature importances; "
+                    "pass validation data to use permutation importance"
+                )
+            return self.get_permutation_importance(df, **permutation_kwargs)[['feature', 'importance']]
+        
+        importance_df = pd.DataFrame({
+            'feature': self._feature_columns,
+            'importance': self._backend.importance(self.model)
+        }).sort_values('importance', ascending=False)
+        
+        return importance_df
+    
+    def get_permutation_importance(
+        self,
+        df: pd.DataFrame,
+        n_repeats: int = 5,
+        max_rows: Optional[int] = None,
+        n_jobs: int = -1,
+        random_state: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Get permutation importance: the drop in ROC AUC when a feature is shuffled.
+        
+        Works for every backend and is not biased toward high-cardinality
+        features. Features are split across n_jobs worker processes; each worker
+        permutes columns in place on a single reused copy of the data.
+        
+        Args:
+            df: Validation dataframe containing feature and target columns
+            n_repeats: Number of shuffles per feature
+            max_rows: Optional row subsample size to bound the cost on large data
+            n_jobs: Number of parallel workers (-1 uses all cores)
+            random_state: Seed for the subsample and the permutations
+            
+        Returns:
+            DataFrame with features, mean importance and its standard deviation
+        """
+        if not self._is_trained:
+            raise RuntimeError("Model must be trained first")
+        
+        missing_features = set(self._feature_columns) - set(column_names(df))
+        if missing_features:
+            raise ValueError(f"Missing feature columns: {missing_features}")
+        
+        if self._target_column not in column_names(df):
+            raise ValueError(f"Target column '{self._target_column}' not found")
+        
+        seed_sequence = np.random.SeedSequence(random_state)
+        subsample_seed, *feature_seeds = seed_sequence.spawn(len(self._feature_columns) + 1)
+        
+        X = feature_frame(df, self._feature_columns).to_numpy(dtype=np.float64)
+        y = target_values(df, self._target_column).to_numpy()
+        if max_rows is not None and max_rows < len(X):
+            rows = np.sort(np.random.default_rng(subsample_seed).choice(len(X), size=max_rows, replace=False))
+            X, y = X[rows], y[rows]
+        
+        from joblib import Parallel, delayed, effective_n_jobs
+        from sklearn.metrics import roc_auc_score
+
+        baseline = roc_auc_score(
+            y, self.model.predict_proba(pd.DataFrame(X, columns=self._feature_columns))[:, 1]
+        )
+        
+        # One chunk of features (and so one buffer) per worker
+        n_chunks = min(effective_n_jobs(n_jobs), len(self._feature_columns))
+        chunks = np.array_split(np.arange(len(self._feature_columns)), n_chunks)
+        chunk_results = Parallel(n_jobs=n_chunks)(
+            delayed(_permutation_scores)(
+                self.model, X, y, self._feature_columns,
+                chunk.tolist(), [feature_seeds[j] for j in chunk], n_repeats
+            )
+            for chunk in chunks
+        )
         
+        drops = baseline - np.vstack([scores for chunk in chunk_results for scores in chunk])
         importance_df = pd.DataFrame({
             'feature': self._feature_columns,
-            'importance': self.model.feature_importances_
+            'importance': drops.mean(axis=1),
+            'importance_std': drops.std(axis=1)
         }).sort_values('importance', ascending=False)
         
         return importance_df
@@ -0,0 +1,130 @@
+"""Pipeline class for chaining preprocessing/feature steps with a model."""
+
+import pickle
+from pathlib import Path
+from typing import Any, List, Optional, Union
+import pandas as pd
+
+from .cache import PredictionCache
+from .model import DiabetesModel
+from .preprocess import NaNMeanFiller, NaNRowRemover
+from .profiling import profiled
+
+
+class Pipeline:
+    """
+    Chains fitted preprocessing and feature steps with an optional DiabetesModel.
+    Mirrors the notebook workflow: each step is fit on the training data and
+    then applied, in order, to any new data before prediction.
+
+    When the model's backend handles missing values natively, NaNRowRemover
+    and NaNMeanFiller steps are skipped so the estimator sees the raw NaNs.
+    """
+
+    # Steps that only exist to get rid of missing values
+    MISSING_VALUE_STEPS = (NaNRowRemover, NaNMeanFiller)
+
+    def __init__(self, steps: List[Any], model: Optional[DiabetesModel] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            steps: Ordered list of objects with fit()/transform()
+                   (e.g. NaNRowRemover, NaNMeanFiller, BaseFeature subclasses)
+            model: Optional DiabetesModel trained on the transformed data
+        """
+        self.steps = list(steps)
+        self.model = model
+        self.is_fitted = False
+        # Steps run by transform(); chosen in fit() from the model's backend
+        self.active_steps = list(self.steps)
+
+    @profiled
+    def fit(self, df: pd.DataFrame) -> 'Pipeline':
+        """
+        Fit every step in order, then train the model on the result.
+
+        Args:
+            df: Training dataframe
+
+        Returns:
+            self for method chaining
+        """
+        self.active_steps = list(self.steps)
+        if self.model is not None and self.model.handles_missing:
+            self.active_steps = [step for step in self.steps if not isinstance(step, self.MISSING_VALUE_STEPS)]
+
+        for step in self.active_steps:
+            df = step.fit_transform(df)
+
+        if self.model is not None:
+            self.model.train(df)
+
+        self.is_fitted = True
+        return self
+
+    @profiled
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Apply every fitted step in order.
+
+        Args:
+            df: Input dataframe
+
+        Returns:
+            Transformed dataframe
+        """
+        if not self.is_fitted:
+            raise RuntimeError("Pipeline must be fitted before transform. Call fit() first.")
+
+        for step in self.active_steps:
+            df = step.transform(df)
+        return df
+
+    @profiled
+    def predict(self, df: pd.DataFrame, cache: Optional[PredictionCache] = None) -> pd.DataFrame:
+        """
+        Transform the data and predict class probabilities.
+
+        Rows dropped by a step (e.g. NaNRowRemover) are absent from the result;
+        the returned index matches the surviving input rows.
+
+        Args:
+            df: Input dataframe
+            cache: Optional PredictionCache passed on to DiabetesModel.predict()
+
+        Returns:
+            DataFrame with predicted probabilities for each class
+        """
+        if self.model is None:
+            raise RuntimeError("Pipeline has no model to predict with")
+
+        return self.model.predict(self.transform(df), cache=cache)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Pickle the fitted pipeline (steps and model) to disk.
+
+        Args:
+            path: Destination file path
+        """
+        with open(Path(path), "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'Pipeline':
+        """
+        Load a pipeline previously written with save().
+
+        Args:
+            path: Path to the pickled pipeline
+
+        Returns:
+            The loaded Pipeline
+        """
+        with open(Path(path), "rb") as f:
+            pipeline = pickle.load(f)
+
+        if not isinstance(pipeline, cls):
+            raise TypeError(f"File {path} does not contain a {cls.__name__}")
+        return pipeline
@@ -1,8 +1,11 @@
 """Preprocessing classes for data cleaning."""
 
-from typing import List
+from typing import Dict, List, Optional
 import pandas as pd
 
+from .frames import collect, column_names, import_polars, is_polars, missing_exprs, pandas_mean
+from .profiling import profiled
+
 
 class NaNRowRemover:
     """Removes rows containing NaN values in specified columns."""
@@ -17,6 +20,7 @@ class NaNRowRemover:
         self.columns_to_check = columns_to_check
         self.is_fitted = False
     
+    @profiled
     def fit(self, df: pd.DataFrame) -> 'NaNRowRemover':
         """
         Fit the preprocessor by validating columns exist.
@@ -27,13 +31,14 @@ class NaNRowRemover:
         Returns:
             self for method chaining
         """
-        missing_cols = set(self.columns_to_check) - set(df.columns)
+        missing_cols = set(self.columns_to_check) - set(column_names(df))
         if missing_cols:
             raise ValueError(f"Columns not found in dataframe: {missing_cols}")
         
         self.is_fitted = True
         return self
     
+    @profiled
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Remove rows with NaN in specified columns.
@@ -47,6 +52,12 @@ class NaNRowRemover:
         if not self.is_fitted:
             raise RuntimeError("Preprocessor must be fitted before transform. Call fit() first.")
         
+        if is_polars(df):
+            if not self.columns_to_check:
+                return df
+            pl = import_polars()
+            return df.filter(~pl.any_horizontal(missing_exprs(df, self.columns_to_check)))
+
         return df.dropna(subset=self.columns_to_check).copy()
     
     def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -76,6 +87,30 @@ class NaNMeanFiller:
         self.means_ = {}  # Store learned means (sklearn convention: _ suffix for learned attributes)
         self.is_fitted = False
     
+    @classmethod
+    def from_means(cls, means: Dict[str, float], columns_to_fill: Optional[List[str]] = None) -> 'NaNMeanFiller':
+        """
+        Create a fitted filler from precomputed means, e.g. the full-data means
+        returned by DataLoader.load_sample().
+        
+        Args:
+            means: Mapping of column name to mean
+            columns_to_fill: Columns to fill (default: every column in means)
+            
+        Returns:
+            Fitted NaNMeanFiller
+        """
+        columns_to_fill = list(means) if columns_to_fill is None else columns_to_fill
+        missing_cols = set(columns_to_fill) - set(means)
+        if missing_cols:
+            raise ValueError(f"No mean given for columns: {missing_cols}")
+        
+        filler = cls(columns_to_fill)
+        filler.means_ = {col: means[col] for col in columns_to_fill}
+        filler.is_fitted = True
+        return filler
+    
+    @profiled
     def fit(self, df: pd.DataFrame) -> 'NaNMeanFiller':
         """
         Fit the preprocessor by learning mean values from data.
@@ -86,17 +121,23 @@ class NaNMeanFiller:
         Returns:
             self for method chaining
         """
-        missing_cols = set(self.columns_to_fill) - set(df.columns)
+        missing_cols = set(self.columns_to_fill) - set(column_names(df))
         if missing_cols:
             raise ValueError(f"Columns not found in dataframe: {missing_cols}")
         
         # Learn and store the mean for each column
-        for col in self.columns_to_fill:
-            self.means_[col] = df[col].mean()
+        if is_polars(df):
+            values = collect(df.select(self.columns_to_fill))
+            for col in self.columns_to_fill:
+                self.means_[col] = pandas_mean(values[col])
+        else:
+            for col in self.columns_to_fill:
+                self.means_[col] = df[col].mean()
         
         self.is_fitted = True
         return self
     
+    @profiled
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Fill NaN values with learned means.
@@ -110,11 +151,28 @@ class NaNMeanFiller:
         if not self.is_fitted:
             raise RuntimeError("Preprocessor must be fitted before transform. Call fit() first.")
         
+        if is_polars(df):
+            return self._transform_polars(df)
+
         df_filled = df.copy()
         for col in self.columns_to_fill:
             df_filled[col] = df_filled[col].fillna(self.means_[col])
         
         return df_filled
+
+    def _transform_polars(self, df):
+        pl = import_polars()
+        schema = df.collect_schema()
+        exprs = []
+        for col in self.columns_to_fill:
+            mean = self.means_[col]
+            if schema[col].is_float():
+                exprs.append(pl.col(col).fill_null(mean).fill_nan(mean))
+            elif hasattr(df, "collect") or df[col].null_count():
+                # Filling an integer column with a float mean makes it Float64; an eager
+                # frame leaves complete integer columns alone, as pandas does
+                exprs.append(pl.col(col).fill_null(mean))
+        return df.with_columns(exprs) if exprs else df
     
     def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -0,0 +1,215 @@
+"""Stage profiler for hw5lib fit/transform/train/predict calls."""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Profiler that decorated stages report to; None means profiling is disabled
+_ACTIVE_PROFILER: Optional['StageProfiler'] = None
+
+
+def profiled(method: Callable) -> Callable:
+    """
+    Mark a method as a pipeline stage.
+
+    When no StageProfiler is active the wrapper only checks a module global
+    before calling through, so the cost of leaving stages decorated is negligible.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        profiler = _ACTIVE_PROFILER
+        if profiler is None:
+            return method(self, *args, **kwargs)
+        return profiler._record(f"{type(self).__name__}.{method.__name__}", method, self, args, kwargs)
+    return wrapper
+
+
+def _n_rows(obj: Any) -> Optional[int]:
+    shape = getattr(obj, 'shape', None)
+    if shape:
+        return int(shape[0])
+    if isinstance(obj, tuple):  # e.g. DataLoader.load() -> (train_df, test_df)
+        counts = [_n_rows(item) for item in obj]
+        if counts and all(count is not None for count in counts):
+            return sum(counts)
+    return None
+
+
+def _max_rss_bytes() -> Optional[int]:
+    # Process-lifetime high-water mark of the resident set size
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return int(peak) if sys.platform == 'darwin' else int(peak) * 1024
+
+
+class StageProfiler:
+    """
+    Records wall time, CPU time, rows in/out, allocations and RSS per stage.
+
+    Use as a context manager around a pipeline run; every decorated hw5lib
+    method called inside the block (DataLoader.load, fit/transform of the
+    preprocessors and features, DiabetesModel.train/predict, ...) is recorded.
+    Nested stages (e.g. Pipeline.fit calling each step) are recorded separately.
+
+    The OS only reports the process-lifetime RSS high-water mark, so each
+    stage records it twice: rss_growth_bytes is how far the stage raised that
+    mark (0 when it stayed below an earlier peak) and process_max_rss_bytes is
+    the mark itself when the stage finished.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        """
+        Initialize the profiler.
+
+        Args:
+            trace_memory: Also record bytes allocated per stage with tracemalloc
+                          (accurate but slows Python-level allocation noticeably)
+        """
+        self.trace_memory = trace_memory
+        self.events: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._previous: Optional['StageProfiler'] = None
+        self._started_tracemalloc = False
+
+    def __enter__(self) -> 'StageProfiler':
+        global _ACTIVE_PROFILER
+        self._previous = _ACTIVE_PROFILER
+        _ACTIVE_PROFILER = self
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        global _ACTIVE_PROFILER
+        _ACTIVE_PROFILER = self._previous
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _record(self, name: str, method: Callable, obj: Any, args: tuple, kwargs: dict) -> Any:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+
+        frame = {'peak': 0}
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame['start_alloc'] = current
+        stack.append(frame)
+
+        rss_start = _max_rss_bytes()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            result = method(obj, *args, **kwargs)
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            stack.pop()
+
+        event = {
+            'stage': name,
+            'start_s': wall_start - self._origin,
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'rows_in': _n_rows(args[0]) if args else None,
+            'rows_out': _n_rows(result),
+            'alloc_bytes': None,
+            'peak_alloc_bytes': None,
+            'rss_growth_bytes': None,
+            'process_max_rss_bytes': None,
+            'depth': len(stack),
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+        }
+        if rss_start is not None:
+            event['process_max_rss_bytes'] = _max_rss_bytes()
+            event['rss_growth_bytes'] = event['process_max_rss_bytes'] - rss_start
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, frame['peak'])
+            event['alloc_bytes'] = current - frame['start_alloc']
+            event['peak_alloc_bytes'] = peak - frame['start_alloc']
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+
+        with self._lock:
+            self.events.append(event)
+        return result
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Aggregate the recorded events per stage.
+
+        Returns:
+            DataFrame with calls, total/mean wall time, CPU time, rows and memory per stage,
+            sorted by total wall time
+        """
+        columns = ['stage', 'calls', 'wall_s', 'mean_wall_s', 'cpu_s', 'rows_in', 'rows_out',
+                   'alloc_bytes', 'peak_alloc_bytes', 'rss_growth_bytes', 'process_max_rss_bytes']
+        if not self.events:
+            return pd.DataFrame(columns=columns)
+
+        events = pd.DataFrame(self.events)
+        summary = events.groupby('stage', sort=False).agg(
+            calls=('wall_s', 'size'),
+            wall_s=('wall_s', 'sum'),
+            mean_wall_s=('wall_s', 'mean'),
+            cpu_s=('cpu_s', 'sum'),
+            rows_in=('rows_in', 'sum'),
+            rows_out=('rows_out', 'sum'),
+            alloc_bytes=('alloc_bytes', 'sum'),
+            peak_alloc_bytes=('peak_alloc_bytes', 'max'),
+            rss_growth_bytes=('rss_growth_bytes', 'max'),
+            process_max_rss_bytes=('process_max_rss_bytes', 'max'),
+        ).reset_index()
+        return summary.sort_values('wall_s', ascending=False)[columns].reset_index(drop=True)
+
+    def to_chrome_trace(self, path: Union[str, Path]) -> None:
+        """
+        Write the events in Chrome trace format (open in chrome://tracing or Perfetto).
+
+        Args:
+            path: Destination JSON file
+        """
+        trace_events = []
+        for event in self.events:
+            args = {key: event[key] for key in
+                    ('cpu_s', 'rows_in', 'rows_out', 'alloc_bytes', 'peak_alloc_bytes',
+                     'rss_growth_bytes', 'process_max_rss_bytes')
+                    if event[key] is not None}
+            trace_events.append({
+                'name': event['stage'],
+                'cat': 'hw5lib',
+                'ph': 'X',
+                'ts': event['start_s'] * 1e6,
+                'dur': event['wall_s'] * 1e6,
+                'pid': event['pid'],
+                'tid': event['tid'],
+                'args': args,
+            })
+
+        with open(Path(path), 'w') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
@@ -0,0 +1,416 @@
+"""
+Asyncio scoring service with dynamic request batching.
+
+Loads a saved Pipeline once and serves predictions over HTTP (TCP or a Unix
+socket). Concurrent requests are coalesced into micro-batches that are scored
+in a thread or process pool.
+
+Run locally with:
+    python -m hw5lib.serving --pipeline model.pkl --port 8080
+
+Endpoints:
+    POST /predict   body: {"records": [{...}, ...]} -> {"predictions": [...]}
+    GET  /stats     throughput and latency percentiles
+    GET  /health    liveness check
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .pipeline import Pipeline
+
+
+# Pipeline loaded once per worker process when using a process pool
+_WORKER_PIPELINE: Optional[Pipeline] = None
+
+
+def _init_worker(pipeline_path: str) -> None:
+    global _WORKER_PIPELINE
+    _WORKER_PIPELINE = Pipeline.load(pipeline_path)
+
+
+def _score_frame(pipeline: Pipeline, df: pd.DataFrame) -> np.ndarray:
+    """Positive-class probability per input row (NaN for rows dropped by a step)."""
+    transformed = pipeline.transform(df)
+    if transformed.empty:
+        return np.full(len(df), np.nan)
+    proba = pipeline.model.predict(transformed)
+    return proba.iloc[:, -1].reindex(df.index).to_numpy(dtype=float)
+
+
+def _score_frame_in_worker(df: pd.DataFrame) -> np.ndarray:
+    return _score_frame(_WORKER_PIPELINE, df)
+
+
+class ServiceStats:
+    """Request counters plus a sliding window of request latencies."""
+
+    def __init__(self, window: int = 10_000):
+        """
+        Args:
+            window: Number of most recent request latencies kept for percentiles
+        """
+        self.started_at = time.perf_counter()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.errors = 0
+        self._latencies: Deque[float] = deque(maxlen=window)
+
+    def record_request(self, n_rows: int, latency_s: float) -> None:
+        self.requests += 1
+        self.rows += n_rows
+        self._latencies.append(latency_s)
+
+    def record_batch(self) -> None:
+        self.batches += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Summarize throughput and latency percentiles.
+
+        Returns:
+            Dictionary with counts, rows/requests per second and p50/p90/p99 latency
+            (ms; None before the first request, so the result stays valid JSON)
+        """
+        uptime = time.perf_counter() - self.started_at
+        latencies_ms = np.asarray(self._latencies, dtype=float) * 1000.0
+        if latencies_ms.size:
+            p50, p90, p99 = (float(p) for p in np.percentile(latencies_ms, [50, 90, 99]))
+        else:
+            p50 = p90 = p99 = None
+
+        return {
+            "uptime_s": uptime,
+            "requests": self.requests,
+            "rows": self.rows,
+            "batches": self.batches,
+            "errors": self.errors,
+            "mean_batch_requests": self.requests / self.batches if self.batches else 0.0,
+            "requests_per_s": self.requests / uptime if uptime > 0 else 0.0,
+            "rows_per_s": self.rows / uptime if uptime > 0 else 0.0,
+            "latency_ms": {"p50": p50, "p90": p90, "p99": p99},
+        }
+
+
+class BatchingScorer:
+    """
+    Coalesces concurrent score() calls into micro-batches.
+
+    A batch is dispatched as soon as it holds max_batch_rows rows or the oldest
+    queued request has waited max_wait_ms, whichever comes first. Up to
+    max_concurrent_batches batches are scored in the executor at once.
+    """
+
+    def __init__(
+        self,
+        pipeline: Pipeline,
+        *,
+        executor: Optional[Executor] = None,
+        pipeline_path: Optional[str | Path] = None,
+        max_batch_rows: int = 1024,
+        max_wait_ms: float = 5.0,
+        max_concurrent_batches: int = 2,
+    ):
+        """
+        Initialize the scorer.
+
+        Args:
+            pipeline: Fitted Pipeline (used directly with thread executors)
+            executor: Executor to score batches in (default: a ThreadPoolExecutor)
+            pipeline_path: Required for ProcessPoolExecutor; workers must have been
+                           initialized with _init_worker(pipeline_path)
+            max_batch_rows: Dispatch a batch once it holds this many rows
+            max_wait_ms: Latency budget a request may wait for others to join its batch
+            max_concurrent_batches: Number of batches scored concurrently
+        """
+        self.pipeline = pipeline
+        self.executor = executor if executor is not None else ThreadPoolExecutor(max_concurrent_batches)
+        self._use_worker_pipeline = isinstance(self.executor, ProcessPoolExecutor)
+        if self._use_worker_pipeline and pipeline_path is None:
+            raise ValueError("pipeline_path is required when scoring in a process pool")
+        self.max_batch_rows = max_batch_rows
+        self.max_wait_s = max_wait_ms / 1000.0
+        self.stats = ServiceStats()
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._max_concurrent_batches = max_concurrent_batches
+        self._loop_task: Optional[asyncio.Task] = None
+        self._batch_tasks: set = set()
+
+    async def start(self) -> None:
+        """Start the background batching loop on the running event loop."""
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self._max_concurrent_batches)
+        self._loop_task = asyncio.create_task(self._batch_loop())
+
+    async def stop(self) -> None:
+        """Stop batching and wait for in-flight batches to finish."""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+
+    async def score(self, records: List[Dict[str, Any]]) -> List[Optional[float]]:
+        """
+        Score a list of records, batched together with concurrent callers.
+
+        Args:
+            records: Raw (untransformed) feature records, one dict per encounter
+
+        Returns:
+            Positive-class probability per record (None if a step dropped the row)
+        """
+        if self._queue is None:
+            raise RuntimeError("Scorer must be started before scoring. Call start() first.")
+
+        started = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((records, future))
+        result = await future
+        self.stats.record_request(len(records), time.perf_counter() - started)
+        return result
+
+    async def _batch_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self._queue.get()
+            pending = [first]
+            n_rows = len(first[0])
+            deadline = loop.time() + self.max_wait_s
+
+            while n_rows < self.max_batch_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                n_rows += len(item[0])
+
+            await self._slots.acquire()
+            task = asyncio.create_task(self._run_batch(pending))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _score(self, records: List[Dict[str, Any]]) -> np.ndarray:
+        df = pd.DataFrame.from_records(records)
+        loop = asyncio.get_running_loop()
+        if self._use_worker_pipeline:
+            return await loop.run_in_executor(self.executor, _score_frame_in_worker, df)
+        return await loop.run_in_executor(self.executor, _score_frame, self.pipeline, df)
+
+    @staticmethod
+    def _set_scores(future: asyncio.Future, scores: np.ndarray) -> None:
+        if not future.done():
+            future.set_result([None if np.isnan(s) else float(s) for s in scores])
+
+    async def _run_batch(self, pending: List[Tuple[List[Dict[str, Any]], asyncio.Future]]) -> None:
+        try:
+            try:
+                scores = await self._score([record for request, _ in pending for record in request])
+            except Exception:
+                if len(pending) == 1:
+                    raise
+                # One malformed request must not fail the others sharing its batch:
+                # score each request on its own so only the bad caller gets the error
+                for request, future in pending:
+                    try:
+                        self._set_scores(future, await self._score(request))
+                    except Exception as exc:
+                        self.stats.errors += 1
+                        if not future.done():
+                            future.set_exception(exc)
+                self.stats.record_batch()
+                return
+            self.stats.record_batch()
+
+            offset = 0
+            for request, future in pending:
+                self._set_scores(future, scores[offset:offset + len(request)])
+                offset += len(request)
+        except Exception as exc:
+            self.stats.errors += 1
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+        finally:
+            self._slots.release()
+
+
+class ScoringService:
+    """Minimal HTTP/1.1 front end for a BatchingScorer."""
+
+    def __init__(self, scorer: BatchingScorer):
+        """
+        Args:
+            scorer: The batching scorer that handles /predict requests
+        """
+        self.scorer = scorer
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        unix_socket: Optional[str | Path] = None,
+    ) -> asyncio.AbstractServer:
+        """
+        Start listening on a TCP port or, if given, a Unix socket path.
+
+        Returns:
+            The underlying asyncio server
+        """
+        await self.scorer.start()
+        if unix_socket is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=str(unix_socket))
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server
+
+    async def stop(self) -> None:
+        """Stop accepting connections and drain the scorer."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.scorer.stop()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "malformed request line"}, keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0) or 0)
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                status, payload = await self._route(method.upper(), target.split("?", 1)[0], body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionResetError:
+                pass
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        if path == "/health" and method == "GET":
+            return 200, {"status": "ok"}
+        if path == "/stats" and method == "GET":
+            return 200, self.scorer.stats.snapshot()
+        if path == "/predict" and method == "POST":
+            try:
+                data = json.loads(body or b"null")
+                records = data["records"] if isinstance(data, dict) else data
+                if not isinstance(records, list):
+                    raise ValueError("expected a list of records")
+            except (ValueError, KeyError) as exc:
+                return 400, {"error": f"invalid request body: {exc}"}
+            try:
+                predictions = await self.scorer.score(records)
+            except Exception as exc:
+                return 500, {"error": str(exc)}
+            return 200, {"predictions": predictions}
+        return 404, {"error": f"no route for {method} {path}"}
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any], keep_alive: bool) -> None:
+        reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+        body = json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {reasons.get(status, 'OK')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a saved hw5lib Pipeline over HTTP.")
+    parser.add_argument("--pipeline", required=True, help="Path to a pipeline written with Pipeline.save()")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix-socket", default=None, help="Listen on this Unix socket instead of TCP")
+    parser.add_argument("--max-batch-rows", type=int, default=1024)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    args = parser.parse_args(argv)
+
+    pipeline = Pipeline.load(args.pipeline)
+    if args.executor == "process":
+        executor = ProcessPoolExecutor(args.workers, initializer=_init_worker, initargs=(args.pipeline,))
+    else:
+        executor = ThreadPoolExecutor(args.workers)
+
+    scorer = BatchingScorer(
+        pipeline,
+        executor=executor,
+        pipeline_path=args.pipeline,
+        max_batch_rows=args.max_batch_rows,
+        max_wait_ms=args.max_wait_ms,
+        max_concurrent_batches=args.workers,
+    )
+    service = ScoringService(scorer)
+
+    async def _serve() -> None:
+        server = await service.start(args.host, args.port, args.unix_socket)
+        where = args.unix_socket or f"http://{args.host}:{args.port}"
+        print(f"Serving {args.pipeline} on {where}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await service.stop()
+
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Cross-validation runner with a per-fold preprocessing cache."""
+
+import copy
+import hashlib
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+import pandas as pd
+
+from .data import DEFAULT_TARGET
+from .model import DiabetesModel
+from .pipeline import Pipeline
+
+
+def _preprocess_fold(steps: List[Any], train_df: pd.DataFrame, test_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Fit fresh copies of the steps on the fold's training rows only, then apply them."""
+    steps = copy.deepcopy(steps)
+    for step in steps:
+        train_df = step.fit_transform(train_df)
+        test_df = step.transform(test_df)
+    return train_df, test_df
+
+
+def _run_fold(
+    steps: List[Any],
+    train_df: pd.DataFrame,
+    test_df: pd.DataFrame,
+    model_spec: Dict[str, Any],
+    preprocessed: bool
+) -> Dict[str, Any]:
+    """Preprocess (unless cached), train and evaluate one fold."""
+    from sklearn.metrics import roc_auc_score
+
+    start = time.perf_counter()
+    if not preprocessed:
+        train_df, test_df = _preprocess_fold(steps, train_df, test_df)
+    preprocess_seconds = time.perf_counter() - start
+
+    model = DiabetesModel(**model_spec)
+    start = time.perf_counter()
+    model.train(train_df)
+    train_seconds = time.perf_counter() - start
+
+    predictions = model.predict(test_df).iloc[:, -1]
+    auc = roc_auc_score(test_df[model_spec['target_column']], predictions)
+
+    return {
+        'auc': auc,
+        'n_train': len(train_df),
+        'n_test': len(test_df),
+        'preprocess_seconds': preprocess_seconds,
+        'train_seconds': train_seconds,
+        # Send the preprocessed frames back only when the parent has to cache them
+        'frames': None if preprocessed else (train_df, test_df),
+    }
+
+
+class CrossValidator:
+    """
+    Stratified k-fold cross-validation of a preprocessing pipeline plus DiabetesModel.
+
+    Every fold fits its own copies of the steps (NaNMeanFiller, encoders, ...)
+    on that fold's training rows only. Folds run in a process pool. The
+    preprocessed train/test frames of each fold are cached (in memory and,
+    optionally, on disk), so repeated runs with different model settings on
+    the same data skip preprocessing.
+    """
+
+    def __init__(
+        self,
+        steps: Union[Pipeline, List[Any]],
+        n_splits: int = 5,
+        target: str = DEFAULT_TARGET,
+        random_state: int = 42,
+        n_jobs: Optional[int] = None,
+        cache_dir: Optional[Union[str, Path]] = None
+    ):
+        """
+        Initialize the cross-validator.
+
+        Args:
+            steps: Unfitted preprocessing/feature steps, or a Pipeline whose steps are used
+            n_splits: Number of stratified folds
+            target: Name of the target column used for stratification
+            random_state: Seed for the fold assignment
+            n_jobs: Number of worker processes (None uses all cores, 1 runs in-process)
+            cache_dir: Optional directory to persist preprocessed folds across sessions
+        """
+        self.steps = list(steps.steps) if isinstance(steps, Pipeline) else list(steps)
+        self.n_splits = n_splits
+        self.target = target
+        self.random_state = random_state
+        self.n_jobs = n_jobs
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._cache: Dict[str, Tuple[pd.DataFrame, pd.DataFrame]] = {}
+
+    def _fold_keys(self, df: pd.DataFrame) -> List[str]:
+        """Cache key per fold: data content, fold layout and step configuration."""
+        digest = hashlib.sha256()
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        digest.update(pickle.dumps((list(df.columns), self.target, self.n_splits, self.random_state)))
+        digest.update(pickle.dumps(self.steps))
+        base = digest.hexdigest()[:32]
+        return [f"{base}_fold{i}" for i in range(self.n_splits)]
+
+    def _load_cached(self, key: str) -> Optional[Tuple[pd.DataFrame, pd.DataFrame]]:
+        if key in self._cache:
+            return self._cache[key]
+        if self.cache_dir is not None:
+            path = self.cache_dir / f"{key}.pkl"
+            if path.exists():
+                with open(path, "rb") as f:
+                    self._cache[key] = pickle.load(f)
+                return self._cache[key]
+        return None
+
+    def _store_cached(self, key: str, frames: Tuple[pd.DataFrame, pd.DataFrame]) -> None:
+        self._cache[key] = frames
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_dir / f"{key}.pkl", "wb") as f:
+                pickle.dump(frames, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def clear_cache(self) -> None:
+        """Drop the in-memory fold cache (files in cache_dir are kept)."""
+        self._cache.clear()
+
+    def run(self, df: pd.DataFrame, model_spec: Dict[str, Any]) -> pd.DataFrame:
+        """
+        Cross-validate a model specification.
+
+        Args:
+            df: Full (raw) dataframe including the target column
+            model_spec: Keyword arguments for DiabetesModel, e.g.
+                        {'feature_columns': [...], 'hyperparameters': {...}, 'backend': 'hist_gbm'};
+                        target_column defaults to the validator's target
+
+        Returns:
+            DataFrame with one row per fold (auc, sizes, timings, whether
+            preprocessing came from the cache)
+        """
+        if self.target not in df.columns:
+            raise ValueError(f"Target column '{self.target}' not found")
+
+        from sklearn.model_selection import StratifiedKFold
+
+        model_spec = {'target_column': self.target, **model_spec}
+        folds = StratifiedKFold(n_splits=self.n_splits, shuffle=True, random_state=self.random_state)
+        keys = self._fold_keys(df)
+
+        tasks = []
+        for key, (train_idx, test_idx) in zip(keys, folds.split(df, df[self.target])):
+            cached = self._load_cached(key)
+            if cached is not None:
+                tasks.append((self.steps, cached[0], cached[1], model_spec, True))
+            else:
+                tasks.append((self.steps, df.iloc[train_idx], df.iloc[test_idx], model_spec, False))
+
+        if self.n_jobs == 1:
+            results = [_run_fold(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+                results = list(executor.map(_run_fold, *zip(*tasks)))
+
+        rows = []
+        for fold, (key, task, result) in enumerate(zip(keys, tasks, results)):
+            frames = result.pop('frames')
+            if frames is not None:
+                self._store_cached(key, frames)
+            rows.append({'fold': fold, **result, 'preprocess_cached': task[4]})
+
+        return pd.DataFrame(rows)
@@ -0,0 +1,218 @@
+"""
+Unit tests for the diabetes_library package
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import roc_auc_score
+
+from diabetes_library.evaluation import (
+    StreamingEvaluator,
+    compute_auc,
+    compute_auc_ci,
+    compute_grouped_metrics,
+    compute_threshold_curves,
+)
+from diabetes_library.modeling import to_design_matrix, train_model, train_models
+
+# run the tests in terminal with: pytest test/test_diabetes_library.py -v
+
+
+def make_frame(n=2000, seed=0):
+    """Synthetic frame with a binary target driven by the first few columns."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.normal(size=(n, 6)), columns=[f"x{i}" for i in range(6)])
+    logit = df["x0"] + 0.5 * df["x1"] - 0.5 * df["x2"]
+    df["diabetes_mellitus"] = (rng.random(n) < 1 / (1 + np.exp(-logit))).astype(int)
+    return df
+
+
+# TESTS FOR train_models
+def test_train_models_matches_single_fits():
+    df = make_frame()
+    train, test = df.iloc[:1500], df.iloc[1500:]
+    columns = [f"x{i}" for i in range(6)]
+    X, X_test = to_design_matrix(train, columns), to_design_matrix(test, columns)
+    subsets = [[0], [0, 1], [0, 1, 2], [3, 5], [4]]
+
+    results = train_models(X, train["diabetes_mellitus"], subsets, X_test, test["diabetes_mellitus"], n_jobs=2)
+
+    assert [r["features"] for r in results] == subsets
+    for r in results:
+        names = [columns[i] for i in r["features"]]
+        single = train_model(train, names)
+        expected = roc_auc_score(test["diabetes_mellitus"], single.predict_proba(test[names])[:, 1])
+        assert r["auc"] == pytest.approx(expected, abs=1e-3)
+
+
+def test_train_models_rejects_empty_subset():
+    df = make_frame(n=200)
+    X = to_design_matrix(df, ["x0", "x1"])
+    y = df["diabetes_mellitus"]
+    with pytest.raises(ValueError, match="Feature subset 1 is empty"):
+        train_models(X, y, [[0], []], X, y, n_jobs=1)
+
+
+def test_design_matrix_is_float32_column_major():
+    X = to_design_matrix(make_frame(), ["x0", "x1"])
+    assert X.dtype == np.float32
+    assert X.flags["F_CONTIGUOUS"]
+
+
+# TESTS FOR compute_auc_ci
+def make_scored_frame(n=500, seed=0, decimals=2):
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, 2, n)
+    # Rounded scores create ties
+    predictions = np.round(np.clip(0.3 * y + rng.random(n) * 0.7, 0, 1), decimals)
+    return pd.DataFrame({"diabetes_mellitus": y, "predictions": predictions})
+
+
+def test_compute_auc_ci_point_estimate_matches_sklearn():
+    df = make_scored_frame()
+    result = compute_auc_ci(df, n_bootstrap=200, random_state=0)
+
+    assert result["auc"] == pytest.approx(compute_auc(df))
+    assert result["ci_lower"] < result["auc"] < result["ci_upper"]
+    assert result["std_error"] > 0
+
+
+@pytest.mark.parametrize("decimals", [1, 3])
+def test_compute_auc_ci_matches_looped_bootstrap(decimals):
+    df = make_scored_frame(decimals=decimals)
+    result = compute_auc_ci(df, n_bootstrap=2000, random_state=0, n_jobs=2)
+
+    rng = np.random.default_rng(1)
+    looped = []
+    for _ in range(500):
+        sample = df.iloc[rng.integers(0, len(df), len(df))]
+        looped.append(compute_auc(sample))
+
+    assert result["std_error"] == pytest.approx(np.std(looped, ddof=1), rel=0.2)
+
+
+def test_compute_auc_ci_reproducible():
+    df = make_scored_frame()
+    first = compute_auc_ci(df, n_bootstrap=300, random_state=3, n_jobs=2)
+    second = compute_auc_ci(df, n_bootstrap=300, random_state=3, n_jobs=2)
+    assert first == second
+
+
+def test_compute_auc_ci_independent_of_n_jobs():
+    df = make_scored_frame()
+    results = [compute_auc_ci(df, n_bootstrap=1000, random_state=5, n_jobs=n_jobs) for n_jobs in (1, 2, 4)]
+    assert results[0] == results[1] == results[2]
+
+
+def test_compute_auc_ci_missing_columns():
+    with pytest.raises(KeyError):
+        compute_auc_ci(pd.DataFrame({"predictions": [0.1, 0.2]}))
+
+
+# TESTS FOR StreamingEvaluator
+def test_streaming_evaluator_matches_full_metrics():
+    from sklearn.metrics import brier_score_loss, log_loss
+
+    df = make_scored_frame(n=5000, decimals=4)
+    evaluator = StreamingEvaluator(n_bins=1000)
+    for start in range(0, len(df), 700):
+        chunk = df.iloc[start:start + 700]
+        evaluator.update(chunk["diabetes_mellitus"], chunk["predictions"])
+    result = evaluator.result()
+
+    assert result["n"] == 5000
+    assert result["auc"] == pytest.approx(compute_auc(df), abs=1e-3)
+    assert result["log_loss"] == pytest.approx(log_loss(df["diabetes_mellitus"], df["predictions"]))
+    assert result["brier"] == pytest.approx(brier_score_loss(df["diabetes_mellitus"], df["predictions"]))
+
+
+def test_streaming_evaluator_merge():
+    df = make_scored_frame(n=1000)
+    whole = StreamingEvaluator().update(df["diabetes_mellitus"], df["predictions"])
+    left = StreamingEvaluator().update(df["diabetes_mellitus"][:400], df["predictions"][:400])
+    right = StreamingEvaluator().update(df["diabetes_mellitus"][400:], df["predictions"][400:])
+
+    merged = left.merge(right).result()
+    expected = whole.result()
+    assert merged["auc"] == expected["auc"]
+    assert merged["log_loss"] == pytest.approx(expected["log_loss"])
+
+
+def test_streaming_evaluator_empty():
+    with pytest.raises(ValueError):
+        StreamingEvaluator().result()
+
+
+# TESTS FOR compute_grouped_metrics
+def test_grouped_metrics_match_groupby_apply():
+    df = make_scored_frame(n=3000, decimals=2)
+    rng = np.random.default_rng(5)
+    df["hospital_id"] = rng.integers(0, 40, len(df))
+    df["icu_type"] = rng.choice(["CTICU", "MICU", "Med-Surg ICU"], len(df))
+
+    result = compute_grouped_metrics(df, "hospital_id")
+    expected = df.groupby("hospital_id").apply(compute_auc)
+
+    assert list(result.index) == list(expected.index)
+    np.testing.assert_allclose(result["auc"], expected, rtol=1e-12)
+    assert result["n"].sum() == len(df)
+    np.testing.assert_allclose(result["prevalence"], df.groupby("hospital_id")["diabetes_mellitus"].mean())
+
+    multi = compute_grouped_metrics(df, ["hospital_id", "icu_type"])
+    sample = df[(df["hospital_id"] == 3) & (df["icu_type"] == "MICU")]
+    assert multi.loc[(3, "MICU"), "auc"] == pytest.approx(compute_auc(sample))
+
+
+def test_grouped_metrics_single_class_group_is_nan():
+    df = pd.DataFrame({
+        "diabetes_mellitus": [0, 0, 1, 0, 1],
+        "predictions": [0.1, 0.2, 0.9, 0.3, 0.4],
+        "hospital_id": [1, 1, 2, 2, 2],
+    })
+    result = compute_grouped_metrics(df)
+
+    assert np.isnan(result.loc[1, "auc"])
+    assert result.loc[2, "auc"] == pytest.approx(1.0)
+
+
+# TESTS FOR compute_threshold_curves
+def test_threshold_curves_match_sklearn():
+    from sklearn.metrics import average_precision_score, roc_curve
+
+    df = make_scored_frame(n=2000, decimals=2)
+    curves = compute_threshold_curves(df, n_calibration_bins=5)
+    thresholds = curves["thresholds"]
+
+    assert curves["roc_auc"] == pytest.approx(compute_auc(df))
+    assert curves["average_precision"] == pytest.approx(
+        average_precision_score(df["diabetes_mellitus"], df["predictions"])
+    )
+
+    fpr, tpr, sk_thresholds = roc_curve(df["diabetes_mellitus"], df["predictions"], drop_intermediate=False)
+    np.testing.assert_allclose(thresholds["threshold"], sk_thresholds[1:])
+    np.testing.assert_allclose(thresholds["sensitivity"], tpr[1:])
+    np.testing.assert_allclose(thresholds["fpr"], fpr[1:])
+
+    row = thresholds.iloc[10]
+    predicted = df["predictions"] >= row["threshold"]
+    assert row["tp"] == (predicted & (df["diabetes_mellitus"] == 1)).sum()
+    assert row["tn"] == (~predicted & (df["diabetes_mellitus"] == 0)).sum()
+
+
+def test_threshold_curves_calibration_bins():
+    df = pd.DataFrame({
+        "diabetes_mellitus": [0, 1, 0, 1, 1, 0],
+        "predictions": [0.1, 0.2, 0.5, 0.7, 0.9, 1.0],
+    })
+    calibration = compute_threshold_curves(df, n_calibration_bins=2)["calibration"]
+
+    assert calibration["n"].tolist() == [2, 4]
+    assert calibration["observed_rate"].tolist() == [0.5, 0.5]
+    assert calibration["mean_prediction"].tolist() == pytest.approx([0.15, 0.775])
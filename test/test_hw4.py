@@ -3,11 +3,13 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import datetime as dt
+import numpy as np
 import pandas as pd
 import pytest
 from geopy.distance import distance
 
-from hw4 import count_simba, get_day_month_year, compute_distance, sum_general_int_list
+from hw4 import count_patterns, count_patterns_in_file, count_simba, get_day_month_year, compute_distance, sum_general_int_list
+from hw4 import haversine_distance, iter_general_int_list, pairwise_distance, vincenty_distance
 
 
 # TESTS FOR count_simba
@@ -35,6 +37,39 @@ def test_count_simba_case_sensitive():
     assert count_simba(sentences) == 1  
 
 
+# TESTS FOR count_patterns
+@pytest.mark.parametrize("method", [None, "str.count", "automaton", "pyahocorasick"])
+def test_count_patterns_matches_str_count(method):
+    if method == "pyahocorasick":
+        pytest.importorskip("ahocorasick")
+    sentences = ["Simba and Nala", "aaaa banana", "Nala, Simba, Simba", "", "a\0a"]
+    patterns = ["Simba", "Nala", "aa", "ana", "a", "zebra", "a\0"]
+    result = count_patterns(sentences, patterns, method=method)
+    assert result == {p: sum(s.count(p) for s in sentences) for p in patterns}
+
+
+def test_count_patterns_no_match_across_texts():
+    assert count_patterns(["ab", "cd"], ["bc", "b"], method="str.count") == {"bc": 0, "b": 1}
+    assert count_patterns(["ab", "cd"], ["bc", "b"], method="automaton") == {"bc": 0, "b": 1}
+
+
+def test_count_patterns_empty_pattern():
+    with pytest.raises(ValueError):
+        count_patterns(["Simba"], ["Simba", ""])
+
+
+def test_count_patterns_in_file(tmp_path):
+    lines = ["Simba and Nala are lions.\n", "Hakuna matata, Simba\n", "no match here\n"] * 50
+    path = tmp_path / "notes.txt"
+    path.write_text("".join(lines))
+    expected = {"Simba": 100, "Nala": 50, "matata": 50}
+
+    assert count_patterns_in_file(path, ["Simba", "Nala", "matata"], chunk_lines=7, n_jobs=1) == expected
+    assert count_patterns_in_file(path, ["Simba", "Nala", "matata"], chunk_lines=7, n_jobs=2) == expected
+    assert count_patterns_in_file(path, ["Simba", "Nala", "matata"], chunk_lines=7, n_jobs=2,
+                                  method="automaton") == expected
+
+
 # TESTS FOR get_day_month_year
 def test_get_day_month_year_basic():
     dates = [dt.date(2020, 5, 17), dt.date(2021, 6, 18), dt.date(2022, 7, 19)]
@@ -59,6 +94,38 @@ def test_get_day_month_year_single_date():
     assert df.iloc[0].to_dict() == {"day": 1, "month": 1, "year": 2000}
 
 
+def test_get_day_month_year_vectorized_matches_list_path():
+    dates = [dt.date(1900, 1, 1) + dt.timedelta(days=i * 37) for i in range(2000)]
+    df = get_day_month_year(dates)
+    expected = pd.DataFrame([{"day": d.day, "month": d.month, "year": d.year} for d in dates])
+
+    assert df.dtypes.tolist() == ["int8", "int8", "int16"]
+    pd.testing.assert_frame_equal(df.astype("int64"), expected)
+
+
+def test_get_day_month_year_series_and_datetime64():
+    series = pd.Series(pd.to_datetime(["2020-02-29 23:00", None, "1850-03-04 08:15"]), index=[10, 11, 12])
+    df = get_day_month_year(series)
+    assert df.index.tolist() == [10, 11, 12]
+    assert df.loc[10].tolist() == [29, 2, 2020]
+    assert df.loc[11].isna().all()
+
+    array = series.dropna().to_numpy()
+    assert get_day_month_year(array)["year"].tolist() == [2020, 1850]
+
+
+def test_get_day_month_year_generator_and_tz_aware_list():
+    dates = [pd.Timestamp("2020-01-01 23:30", tz="US/Pacific") + pd.Timedelta(days=i) for i in range(1500)]
+    df = get_day_month_year(d for d in dates)
+    expected = pd.DataFrame([{"day": d.day, "month": d.month, "year": d.year} for d in dates])
+
+    assert df.iloc[0].tolist() == [1, 1, 2020]
+    pd.testing.assert_frame_equal(df.astype("int64"), expected)
+
+    mixed = dates[:1000] + [pd.Timestamp("2021-06-01 23:30", tz="Asia/Tokyo")] * 500
+    assert get_day_month_year(mixed).iloc[-1].tolist() == [1, 6, 2021]
+
+
 # TESTS FOR compute_distance
 def test_compute_distance_basic():
     coords = [((41.23, 23.5), (41.5, 23.4))]
@@ -83,6 +150,46 @@ def test_compute_distance_empty():
     assert compute_distance([]) == []
 
 
+def random_coords(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lat = rng.uniform(-90, 90, (n, 2))
+    lon = rng.uniform(-180, 180, (n, 2))
+    return np.stack([lat, lon], axis=2)
+
+
+def test_vincenty_distance_matches_geopy():
+    coords = random_coords(500)
+    coords[0] = [[0, 0], [0.5, 179.7]]  # nearly antipodal, falls back to geopy
+    coords[1] = [[10, 10], [10, 10]]
+    expected = compute_distance([tuple(map(tuple, pair)) for pair in coords])
+    np.testing.assert_allclose(vincenty_distance(coords), expected, atol=1e-6)
+
+
+def test_haversine_distance_matches_great_circle():
+    from geopy.distance import great_circle
+
+    coords = random_coords(200)
+    expected = [great_circle(*pair).km for pair in coords]
+    np.testing.assert_allclose(haversine_distance(coords), expected, rtol=1e-9)
+
+
+def test_pairwise_distance_chunks_and_out():
+    coords = random_coords(60, seed=1)
+    patients, hospitals = coords[:, 0], coords[:25, 1]
+    out = np.zeros((60, 25))
+
+    result = pairwise_distance(patients, hospitals, method="vincenty", chunk_rows=7, n_jobs=2, out=out)
+    assert result is out
+    assert out[3, 4] == pytest.approx(distance(patients[3], hospitals[4]).km, abs=1e-6)
+    np.testing.assert_allclose(pairwise_distance(patients, hospitals)[:, 0],
+                               haversine_distance(np.stack([patients, np.repeat(hospitals[:1], 60, 0)], 1)))
+
+
+def test_batch_distance_bad_shape():
+    with pytest.raises(ValueError):
+        haversine_distance(np.zeros((3, 4)))
+
+
 # TESTS FOR sum_general_int_list
 def test_sum_general_int_list_simple():
     lst = [1, 2, 3, 4]
@@ -108,3 +215,36 @@ def test_sum_general_int_list_mixed_types():
     assert sum_general_int_list(lst) == 7
 
 
+def test_sum_general_int_list_very_deep():
+    lst = [1]
+    for _ in range(50_000):
+        lst = [lst, 1]
+    assert sum_general_int_list(lst) == 50_001
+    assert sum(iter_general_int_list(lst)) == 50_001
+
+
+def test_sum_general_int_list_numpy_and_bools():
+    lst = [np.arange(5), [True, 2, [np.array([[1, 2], [3, 4]])]], np.array([1.5, 2.5])]
+    assert sum_general_int_list(lst) == 10 + 1 + 2 + 10
+    assert sum_general_int_list(np.arange(4)) == 6
+
+
+def test_sum_general_int_list_long_runs():
+    ints = list(range(1000))
+    assert sum_general_int_list(ints) == sum(ints)
+    assert sum_general_int_list(ints + [2.5, "x"]) == sum(ints)
+    assert sum_general_int_list([ints, ints + [np.int64(7)], [True] * 100]) == 2 * sum(ints) + 100
+
+
+def test_iter_general_int_list_order_and_laziness():
+    lst = [[2], 4, "x", [1, [2], [3, 5, [7, 8]]], 1]
+    assert list(iter_general_int_list(lst)) == [2, 4, 1, 2, 3, 5, 7, 8, 1]
+    first = next(iter_general_int_list([[[9]], [1, 2]]))
+    assert first == 9
+
+
+def test_sum_general_int_list_cycle():
+    lst = [1, 2]
+    lst.append(lst)
+    with pytest.raises(ValueError):
+        sum_general_int_list(lst)
@@ -13,7 +13,9 @@ import math
 
 import pytest
 
-from hw5 import Card, Circle, Deck, Patient, PlaneFigure, Rectangle, Triangle
+import numpy as np
+
+from hw5 import Card, Circle, Deck, DeckBatch, FigureArray, Patient, PatientRegistry, PlaneFigure, Rectangle, Triangle, simulate_draws
 
 # run the tests in terminal with: pytest test/test_hw5.py -v
 # run test coverage with:
@@ -157,6 +159,58 @@ class TestPatient:
         assert patient.has_covid() == 0.01  # Test result takes priority
 
 
+class TestPatientRegistry:
+    """Test suite for the columnar PatientRegistry"""
+
+    def make_patients(self, n=500):
+        rng = np.random.default_rng(0)
+        vocabulary = ["fever", "cough", "anosmia"] + [f"symptom_{i}" for i in range(70)]
+        patients = []
+        for i in range(n):
+            symptoms = list(rng.choice(vocabulary, rng.integers(0, 6), replace=False))
+            patient = Patient(f"patient_{i}", symptoms)
+            if i % 7 == 0:
+                patient.add_test("covid", i % 2 == 0)
+            if i % 5 == 0:
+                patient.add_test("flu", True)
+            patients.append(patient)
+        return patients
+
+    def test_has_covid_identical_to_patient(self):
+        """Vectorized has_covid returns exactly the per-patient floats"""
+        patients = self.make_patients()
+        registry = PatientRegistry.from_patients(patients)
+
+        assert len(registry) == len(patients)
+        assert registry.has_covid().tolist() == [p.has_covid() for p in patients]
+
+    def test_add_patient_and_tests(self):
+        """Patients and tests added one by one grow the columns"""
+        patients = self.make_patients(100)
+        registry = PatientRegistry(capacity=4)
+        for patient in patients:
+            row = registry.add_patient(patient.name, patient.symptoms)
+            for test_name, result in patient.tests.items():
+                registry.add_test(row, test_name, result)
+
+        assert registry.has_covid().tolist() == [p.has_covid() for p in patients]
+        assert registry.test_results("flu").tolist() == [1 if "flu" in p.tests else -1 for p in patients]
+        assert registry.has_symptom("fever").tolist() == ["fever" in p.symptoms for p in patients]
+
+    def test_to_patient_round_trip(self):
+        """A row converts back to an equivalent Patient"""
+        registry = PatientRegistry()
+        row = registry.add_patient("Alice", ["fever", "cough"])
+        registry.add_test(row, "covid", False)
+
+        patient = registry.to_patient(row)
+        assert patient.name == "Alice"
+        assert sorted(patient.symptoms) == ["cough", "fever"]
+        assert patient.tests == {"covid": False}
+        with pytest.raises(IndexError):
+            registry.add_test(5, "covid", True)
+
+
 # ============================================================================
 # EXERCISE 2: Card and Deck Classes Tests
 # ============================================================================
@@ -313,6 +367,83 @@ class TestDeck:
         card = deck.draw()
         assert card is None
 
+    def test_deck_stores_int8_codes(self):
+        """Deck keeps compact card codes and hands out shared Card instances"""
+        deck = Deck()
+
+        assert deck.codes.dtype == np.int8
+        assert deck.codes.tolist() == list(range(52))
+        assert deck.cards[0] is Card.from_code(0)
+        assert str(deck.draw()) == "K of Spades"
+        assert not hasattr(Card("Hearts", "A"), "__dict__")
+
+    def test_cards_is_read_only(self):
+        """Mutating deck.cards fails loudly; assigning a new sequence updates the codes"""
+        deck = Deck()
+
+        with pytest.raises(AttributeError):
+            deck.cards.pop()
+        with pytest.raises(TypeError):
+            deck.cards[0] = Card("Hearts", "A")
+        assert len(deck.cards) == 52
+
+        deck.cards = [Card("Spades", "K"), Card("Hearts", "A")]
+        assert deck.codes.tolist() == [51, 0]
+        assert str(deck.draw()) == "A of Hearts"
+
+    def test_shuffle_reproducible_with_random_seed(self):
+        """random.seed still controls the shuffle"""
+        import random
+
+        random.seed(3)
+        first = Deck()
+        first.shuffle()
+        random.seed(3)
+        second = Deck()
+        second.shuffle()
+
+        assert first.codes.tolist() == second.codes.tolist()
+        assert sorted(first.codes.tolist()) == list(range(52))
+
+
+class TestDeckBatch:
+    """Test suite for DeckBatch and simulate_draws"""
+
+    def test_shuffle_gives_permutations(self):
+        """Every shuffled deck still holds each card exactly once"""
+        batch = DeckBatch(200, rng=0)
+        batch.shuffle()
+
+        assert batch.codes.shape == (200, 52)
+        assert (np.sort(batch.codes, axis=1) == np.arange(52)).all()
+
+    def test_draw_matches_deck_order(self, capsys):
+        """draw(k) removes the last k cards like k calls to Deck.draw, without printing"""
+        batch = DeckBatch(2)
+        drawn = batch.draw(3)
+
+        deck = Deck()
+        expected = [str(deck.draw()) for _ in range(3)]
+        capsys.readouterr()
+        assert [str(card) for card in DeckBatch.to_cards(drawn)[0]] == expected
+        assert batch.codes.shape == (2, 49)
+        assert capsys.readouterr().out == ""
+        with pytest.raises(ValueError):
+            batch.draw(50)
+
+    def test_simulate_draws_reproducible_across_workers(self):
+        """Results depend only on the seed, not on the process count"""
+        serial = simulate_draws(500, 4, seed=7, chunk_size=120, n_jobs=1)
+        parallel = simulate_draws(500, 4, seed=7, chunk_size=120, n_jobs=2)
+
+        assert serial.shape == (500, 4)
+        assert (serial == parallel).all()
+
+    def test_simulate_draws_probability(self):
+        """First card is an ace about 1 time in 13"""
+        draws = simulate_draws(100_000, 1, seed=0)
+        assert np.mean(draws[:, 0] % 13 == 0) == pytest.approx(1 / 13, abs=0.005)
+
 
 # ============================================================================
 # EXERCISE 3: PlaneFigure Classes Tests
@@ -451,3 +582,46 @@ class TestPolymorphism:
             area = shape.compute_surface()
             assert isinstance(area, (int, float))
             assert area > 0
+
+
+# ============================================================================
+# FIGURE ARRAY TESTS
+# ============================================================================
+
+
+class TestFigureArray:
+    """Test suite for the array-backed FigureArray"""
+
+    def make_figures(self, n=3000):
+        rng = np.random.default_rng(0)
+        figures = []
+        for kind, params in zip(rng.integers(0, 3, n), rng.uniform(0.1, 100, (n, 4)).tolist()):
+            if kind == 0:
+                figures.append(Triangle(*params))
+            elif kind == 1:
+                figures.append(Rectangle(*params[:2]))
+            else:
+                figures.append(Circle(params[0]))
+        return figures
+
+    def test_matches_figure_methods_exactly(self):
+        """Vectorized results equal the per-object methods, in the same order"""
+        figures = self.make_figures()
+        figure_array = FigureArray.from_figures(figures)
+
+        assert len(figure_array) == len(figures)
+        assert figure_array.compute_perimeter().tolist() == [f.compute_perimeter() for f in figures]
+        assert figure_array.compute_surface().tolist() == [f.compute_surface() for f in figures]
+
+    def test_build_from_arrays(self):
+        """Parameter arrays are ordered triangles, rectangles, circles"""
+        figure_array = FigureArray(triangles=[[3, 4, 5, 4]], rectangles=[[2, 3]], circles=[1.0])
+
+        np.testing.assert_allclose(figure_array.compute_perimeter(), [12, 10, 2 * math.pi])
+        np.testing.assert_allclose(figure_array.compute_surface(), [6, 6, math.pi])
+        assert len(FigureArray().compute_surface()) == 0
+
+    def test_unsupported_figure(self):
+        """Figures without a vectorized formula are rejected"""
+        with pytest.raises(TypeError):
+            FigureArray.from_figures([Circle(1), "square"])
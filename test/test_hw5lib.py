@@ -0,0 +1,905 @@
+"""
+Unit tests for the hw5lib package
+"""
+
+import sys
+from pathlib import Path
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from hw5lib import (
+    AgeSquared,
+    BMICalculator,
+    CrossValidator,
+    DiabetesModel,
+    DriftMonitor,
+    GenderEncoder,
+    NaNMeanFiller,
+    NaNRowRemover,
+    Pipeline,
+    PredictionCache,
+    StageProfiler,
+    register_backend,
+)
+from hw5lib.model import ESTIMATOR_BACKENDS
+from hw5lib.serving import BatchingScorer, ScoringService, ServiceStats
+
+# run the tests in terminal with: pytest test/test_hw5lib.py -v
+
+FEATURES = ["age", "gender_numeric", "bmi", "age_squared"]
+
+
+def make_frame(n=400, seed=0):
+    """Synthetic encounters with the columns the notebook pipeline uses."""
+    rng = np.random.default_rng(seed)
+    age = rng.uniform(18, 90, n)
+    height = rng.normal(170, 10, n)
+    weight = rng.normal(80, 15, n)
+    logit = 0.04 * (age - 50) + 0.05 * (weight - 80)
+    df = pd.DataFrame({
+        "age": age,
+        "gender": rng.choice(["M", "F"], n),
+        "ethnicity": rng.choice(["Caucasian", "Asian", "Hispanic"], n),
+        "height": height,
+        "weight": weight,
+        "diabetes_mellitus": (rng.random(n) < 1 / (1 + np.exp(-logit))).astype(int),
+    })
+    df.loc[::17, "height"] = np.nan
+    df.loc[::23, "weight"] = np.nan
+    return df
+
+
+def make_pipeline(**model_kwargs):
+    model_kwargs.setdefault("hyperparameters", {"n_estimators": 20, "max_depth": 4, "random_state": 0})
+    return Pipeline(
+        steps=[
+            NaNRowRemover(columns_to_check=["age", "gender", "ethnicity"]),
+            NaNMeanFiller(columns_to_fill=["height", "weight"]),
+            BMICalculator(),
+            GenderEncoder(),
+            AgeSquared(),
+        ],
+        model=DiabetesModel(feature_columns=FEATURES, target_column="diabetes_mellitus", **model_kwargs),
+    )
+
+
+@pytest.fixture
+def train_df():
+    return make_frame()
+
+
+@pytest.fixture
+def fitted_pipeline(train_df):
+    return make_pipeline().fit(train_df)
+
+
+# ============================================================================
+# Pipeline
+# ============================================================================
+
+
+class TestPipeline:
+    """Test suite for the Pipeline class"""
+
+    def test_predict_matches_manual_steps(self, train_df, fitted_pipeline):
+        """Pipeline.predict gives the same result as applying each step by hand"""
+        df = train_df
+        for step in fitted_pipeline.steps:
+            df = step.transform(df)
+        expected = fitted_pipeline.model.predict(df)
+
+        pd.testing.assert_frame_equal(fitted_pipeline.predict(train_df), expected)
+
+    def test_transform_before_fit_raises(self, train_df):
+        """Using an unfitted pipeline raises"""
+        with pytest.raises(RuntimeError):
+            make_pipeline().transform(train_df)
+
+    def test_save_and_load_roundtrip(self, tmp_path, train_df, fitted_pipeline):
+        """A saved pipeline predicts identically after loading"""
+        path = tmp_path / "pipeline.pkl"
+        fitted_pipeline.save(path)
+        loaded = Pipeline.load(path)
+
+        pd.testing.assert_frame_equal(loaded.predict(train_df), fitted_pipeline.predict(train_df))
+
+
+# ============================================================================
+# Serving
+# ============================================================================
+
+
+class TestServing:
+    """Test suite for the batching scorer and HTTP service"""
+
+    def test_concurrent_requests_are_batched(self, train_df, fitted_pipeline):
+        """Concurrent score() calls are coalesced and return per-record scores"""
+        records = train_df.drop(columns="diabetes_mellitus").head(20).to_dict("records")
+        expected = fitted_pipeline.predict(pd.DataFrame.from_records(records))["prob_class_1"].tolist()
+
+        async def run():
+            scorer = BatchingScorer(fitted_pipeline, max_batch_rows=1000, max_wait_ms=50)
+            await scorer.start()
+            results = await asyncio.gather(*(scorer.score([r]) for r in records))
+            await scorer.stop()
+            return results, scorer.stats.snapshot()
+
+        results, stats = asyncio.run(run())
+
+        assert [r[0] for r in results] == pytest.approx(expected)
+        assert stats["requests"] == 20
+        assert stats["batches"] < 20
+
+    def test_bad_request_does_not_fail_its_batch(self, train_df, fitted_pipeline):
+        """A malformed request only fails its own caller, not others in the same batch"""
+        records = train_df.drop(columns="diabetes_mellitus").head(2).to_dict("records")
+        bad = dict(records[1], age="abc")
+        expected = fitted_pipeline.predict(pd.DataFrame.from_records(records[:1]))["prob_class_1"].tolist()
+
+        async def run():
+            scorer = BatchingScorer(fitted_pipeline, max_batch_rows=1000, max_wait_ms=50)
+            await scorer.start()
+            results = await asyncio.gather(scorer.score(records[:1]), scorer.score([bad]), return_exceptions=True)
+            await scorer.stop()
+            return results, scorer.stats.snapshot()
+
+        (good, error), stats = asyncio.run(run())
+
+        assert good == pytest.approx(expected)
+        assert isinstance(error, Exception)
+        assert stats["errors"] == 1
+
+    def test_dropped_rows_score_none(self, train_df, fitted_pipeline):
+        """Records removed by NaNRowRemover come back as None"""
+        record = train_df.drop(columns="diabetes_mellitus").iloc[0].to_dict()
+        record["age"] = None
+
+        async def run():
+            scorer = BatchingScorer(fitted_pipeline)
+            await scorer.start()
+            result = await scorer.score([record])
+            await scorer.stop()
+            return result
+
+        assert asyncio.run(run()) == [None]
+
+    def test_http_predict_and_stats(self, train_df, fitted_pipeline):
+        """The HTTP front end serves /predict and /stats"""
+        records = train_df.drop(columns="diabetes_mellitus").head(3).to_dict("records")
+
+        async def request(port, method, path, payload=None):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            body = json.dumps(payload).encode() if payload is not None else b""
+            writer.write(
+                f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+            raw = await reader.read()
+            writer.close()
+            head, _, content = raw.partition(b"\r\n\r\n")
+            return int(head.split()[1]), json.loads(content)
+
+        async def run():
+            service = ScoringService(BatchingScorer(fitted_pipeline))
+            server = await service.start("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            predicted = await request(port, "POST", "/predict", {"records": records})
+            stats = await request(port, "GET", "/stats")
+            missing = await request(port, "GET", "/nope")
+            await service.stop()
+            return predicted, stats, missing
+
+        (status, body), (stats_status, stats), (missing_status, _) = asyncio.run(run())
+
+        assert status == 200
+        assert len(body["predictions"]) == 3
+        assert stats_status == 200
+        assert stats["rows"] == 3
+        assert set(stats["latency_ms"]) == {"p50", "p90", "p99"}
+        assert missing_status == 404
+
+    def test_empty_stats_are_strict_json(self):
+        """Before any request the latency percentiles are null, not NaN"""
+        snapshot = ServiceStats().snapshot()
+
+        assert snapshot["latency_ms"] == {"p50": None, "p90": None, "p99": None}
+        json.dumps(snapshot, allow_nan=False)
+
+
+# ============================================================================
+# Prediction cache
+# ============================================================================
+
+
+class TestPredictionCache:
+    """Test suite for PredictionCache and DiabetesModel.predict(cache=...)"""
+
+    def test_cached_predictions_match_uncached(self, train_df, fitted_pipeline):
+        """Cached predictions are identical to direct predictions"""
+        cache = PredictionCache()
+        direct = fitted_pipeline.predict(train_df)
+        first = fitted_pipeline.predict(train_df, cache=cache)
+        second = fitted_pipeline.predict(train_df, cache=cache)
+
+        pd.testing.assert_frame_equal(first, direct)
+        pd.testing.assert_frame_equal(second, direct)
+        assert cache.hit_rate == pytest.approx(0.5)
+
+    def test_only_misses_are_scored(self):
+        """predict_fn only sees rows that are not cached yet"""
+        seen = []
+
+        def predict_fn(X):
+            seen.append(len(X))
+            return np.column_stack([1 - X["a"], X["a"]])
+
+        cache = PredictionCache()
+        X = pd.DataFrame({"a": [0.1, 0.2, 0.3]})
+        cache.predict(X, "v1", predict_fn)
+        cache.predict(pd.DataFrame({"a": [0.2, 0.4, 0.4]}), "v1", predict_fn)
+
+        assert seen == [3, 1]  # duplicate 0.4 rows scored once
+        assert cache.stats()["hits"] == 1
+
+    def test_model_version_is_part_of_key(self):
+        """A new model version does not reuse old entries"""
+        cache = PredictionCache()
+        X = pd.DataFrame({"a": [0.1]})
+        cache.predict(X, "v1", lambda X: np.array([[0.0, 1.0]]))
+        result = cache.predict(X, "v2", lambda X: np.array([[1.0, 0.0]]))
+
+        assert result.tolist() == [[1.0, 0.0]]
+
+    def test_lru_eviction_and_ttl(self):
+        """Cache is bounded and entries expire after ttl"""
+        now = [0.0]
+        cache = PredictionCache(maxsize=2, ttl=10, clock=lambda: now[0])
+        predict_fn = lambda X: np.column_stack([1 - X["a"], X["a"]])
+        cache.predict(pd.DataFrame({"a": [0.1, 0.2, 0.3]}), "v", predict_fn)
+        assert len(cache) == 2
+
+        now[0] = 11.0
+        cache.predict(pd.DataFrame({"a": [0.3]}), "v", predict_fn)
+        assert cache.hits == 0
+
+    def test_retraining_changes_model_version(self, train_df):
+        """Each training run gets a fresh version unless one is fixed"""
+        pipeline = make_pipeline().fit(train_df)
+        first = pipeline.model.model_version
+        pipeline.fit(train_df)
+        assert pipeline.model.model_version != first
+
+        fixed = make_pipeline(model_version="2024-01").fit(train_df)
+        assert fixed.model.model_version == "2024-01"
+
+
+# ============================================================================
+# Estimator backends
+# ============================================================================
+
+
+class TestBackends:
+    """Test suite for DiabetesModel estimator backends"""
+
+    @pytest.mark.parametrize("backend", ["random_forest", "hist_gbm", "logistic"])
+    def test_backends_share_interface(self, train_df, backend):
+        """Every backend trains, predicts and reports importances through the same interface"""
+        pipeline = make_pipeline(backend=backend, hyperparameters={}).fit(train_df)
+        proba = pipeline.predict(train_df)
+
+        assert list(proba.columns) == ["prob_class_0", "prob_class_1"]
+        assert np.allclose(proba.sum(axis=1), 1.0)
+
+        importance = pipeline.model.get_feature_importance(pipeline.transform(train_df), n_jobs=1, random_state=0)
+        assert list(importance.columns) == ["feature", "importance"]
+        assert sorted(importance["feature"]) == sorted(FEATURES)
+        assert importance["importance"].notna().all()
+
+    def test_permutation_fallback_needs_data(self, train_df):
+        """Backends without built-in importances ask for validation data"""
+        pipeline = make_pipeline(backend="hist_gbm", hyperparameters={}).fit(train_df)
+        with pytest.raises(ValueError):
+            pipeline.model.get_feature_importance()
+
+    def test_unknown_backend_raises(self):
+        """An unregistered backend name is rejected"""
+        with pytest.raises(ValueError):
+            DiabetesModel(FEATURES, "diabetes_mellitus", backend="xgboost")
+
+    def test_hist_gbm_trains_on_missing_values(self, train_df):
+        """hist_gbm handles NaN natively so the mean filler can be skipped"""
+        model = DiabetesModel(["age", "height", "weight"], "diabetes_mellitus", backend="hist_gbm")
+        assert model.handles_missing
+        model.train(train_df)
+
+        assert model.predict(train_df).notna().all().all()
+
+    def test_pipeline_skips_missing_value_steps_for_nan_aware_backend(self, train_df):
+        """Backends that handle NaN natively get the raw missing values and keep every row"""
+        train_df.loc[::31, "age"] = np.nan
+        pipeline = make_pipeline(backend="hist_gbm", hyperparameters={"random_state": 0}).fit(train_df)
+        transformed = pipeline.transform(train_df)
+
+        assert not any(isinstance(step, (NaNRowRemover, NaNMeanFiller)) for step in pipeline.active_steps)
+        assert len(transformed) == len(train_df)
+        assert transformed["bmi"].isna().any()
+        assert len(pipeline.predict(train_df)) == len(train_df)
+
+        forest = make_pipeline().fit(train_df)
+        assert forest.active_steps == forest.steps
+        assert not forest.transform(train_df)["bmi"].isna().any()
+
+    def test_logistic_importance(self, train_df):
+        """Linear backends report coefficient-based importances"""
+        pipeline = make_pipeline(backend="logistic", hyperparameters={}).fit(train_df)
+        importance = pipeline.model.get_feature_importance()
+
+        assert set(importance["feature"]) == set(FEATURES)
+        assert (importance["importance"] >= 0).all()
+
+    def test_custom_backend_registration(self, train_df):
+        """register_backend makes a new estimator available by name"""
+        from sklearn.ensemble import ExtraTreesClassifier
+
+        register_backend("extra_trees", ExtraTreesClassifier, defaults={"n_estimators": 10})
+        try:
+            pipeline = make_pipeline(backend="extra_trees", hyperparameters={}).fit(train_df)
+        finally:
+            ESTIMATOR_BACKENDS.pop("extra_trees")
+
+        assert pipeline.model.model.n_estimators == 10
+        assert len(pipeline.predict(train_df)) == len(train_df)
+
+
+# ============================================================================
+# Permutation importance
+# ============================================================================
+
+
+class TestPermutationImportance:
+    """Test suite for DiabetesModel.get_permutation_importance"""
+
+    def make_data(self, n=600):
+        rng = np.random.default_rng(1)
+        df = pd.DataFrame({"signal": rng.normal(size=n), "noise": rng.normal(size=n)})
+        df["diabetes_mellitus"] = (df["signal"] + 0.3 * rng.normal(size=n) > 0).astype(int)
+        return df
+
+    @pytest.mark.parametrize("backend", ["random_forest", "hist_gbm", "logistic"])
+    def test_informative_feature_ranks_first(self, backend):
+        """Permutation importance works for every backend"""
+        df = self.make_data()
+        model = DiabetesModel(["signal", "noise"], "diabetes_mellitus", backend=backend)
+        model.train(df)
+        importance = model.get_permutation_importance(df, n_repeats=3, n_jobs=2, random_state=0)
+
+        assert importance["feature"].tolist() == ["signal", "noise"]
+        assert importance.iloc[0]["importance"] > 0.2
+        assert abs(importance.iloc[1]["importance"]) < 0.05
+
+    def test_reproducible_and_independent_of_n_jobs(self):
+        """Same seed gives the same result regardless of the number of workers"""
+        df = self.make_data()
+        model = DiabetesModel(["signal", "noise"], "diabetes_mellitus", backend="logistic")
+        model.train(df)
+        serial = model.get_permutation_importance(df, n_jobs=1, max_rows=300, random_state=7)
+        parallel = model.get_permutation_importance(df, n_jobs=2, max_rows=300, random_state=7)
+
+        pd.testing.assert_frame_equal(serial, parallel)
+
+    def test_requires_trained_model(self):
+        """Untrained models raise"""
+        model = DiabetesModel(["signal"], "diabetes_mellitus")
+        with pytest.raises(RuntimeError):
+            model.get_permutation_importance(self.make_data())
+
+
+# ============================================================================
+# Budgeted training
+# ============================================================================
+
+
+class TestBudgetedTraining:
+    """Test suite for DiabetesModel.train_with_budget"""
+
+    def transformed(self, n=3000):
+        df = make_frame(n)
+        pipeline = make_pipeline()
+        for step in pipeline.steps:
+            df = step.fit_transform(df)
+        return df
+
+    def test_generous_budget_trains_target(self):
+        """With plenty of time the configured number of trees is kept"""
+        df = self.transformed()
+        model = DiabetesModel(FEATURES, "diabetes_mellitus", hyperparameters={"n_estimators": 20, "random_state": 0})
+        report = model.train_with_budget(df, time_budget_s=120, oob_tol=-1, random_state=0)
+
+        assert report["n_estimators"] == 20
+        assert report["n_rows"] == len(df)
+        assert report["stop_reason"] == "completed"
+        assert 0.5 < report["oob_auc"] <= 1.0
+        assert len(model.model.estimators_) == 20
+        assert model.model.get_params()["oob_score"] is False
+        assert len(model.predict(df)) == len(df)
+
+    def test_time_budget_is_respected(self):
+        """A tight time budget stops growing trees before the wall-clock limit"""
+        df = self.transformed(n=10000)
+        model = DiabetesModel(FEATURES, "diabetes_mellitus", hyperparameters={"n_estimators": 300, "random_state": 0})
+        report = model.train_with_budget(df, time_budget_s=0.5, random_state=0)
+
+        # Generous slack for loaded machines; an unbudgeted fit takes several times longer
+        assert report["elapsed_s"] < 0.5 * 2
+        assert report["n_estimators"] < 300
+        assert report["stop_reason"] == "time_budget"
+
+    def test_hist_gbm_reports_fitted_iterations(self):
+        """Boosting that stops early reports n_iter_, not the requested iterations"""
+        df = self.transformed()
+        model = DiabetesModel(FEATURES, "diabetes_mellitus", backend="hist_gbm",
+                              hyperparameters={"max_iter": 500, "early_stopping": True, "random_state": 0})
+        report = model.train_with_budget(df, time_budget_s=60, random_state=0)
+
+        assert report["n_estimators"] == model.model.n_iter_ < 500
+        assert report["stop_reason"] == "early_stopping"
+
+    def test_memory_budget_limits_model(self):
+        """A tight memory budget yields fewer trees and/or rows"""
+        df = self.transformed()
+        model = DiabetesModel(FEATURES, "diabetes_mellitus", hyperparameters={"n_estimators": 200, "random_state": 0})
+        report = model.train_with_budget(df, memory_budget_mb=1, random_state=0)
+
+        assert report["n_estimators"] < 200 or report["n_rows"] < len(df)
+        assert report["target_n_estimators"] == 200
+        assert model.training_report_ is report
+
+    def test_backend_without_estimators(self):
+        """Backends without trees only adjust rows"""
+        df = self.transformed()
+        model = DiabetesModel(FEATURES, "diabetes_mellitus", backend="logistic")
+        report = model.train_with_budget(df, time_budget_s=60)
+
+        assert report["n_estimators"] is None
+        assert report["n_rows"] == len(df)
+
+    def test_budget_required(self):
+        """At least one budget must be given"""
+        model = DiabetesModel(FEATURES, "diabetes_mellitus")
+        with pytest.raises(ValueError):
+            model.train_with_budget(self.transformed())
+
+
+# ============================================================================
+# Cross-validation
+# ============================================================================
+
+
+class TestCrossValidator:
+    """Test suite for CrossValidator"""
+
+    MODEL_SPEC = {"feature_columns": FEATURES, "hyperparameters": {"n_estimators": 10, "random_state": 0}}
+
+    def test_folds_are_evaluated(self, train_df):
+        """Each fold reports an AUC and covers the data once"""
+        cv = CrossValidator(make_pipeline(), n_splits=4, n_jobs=2)
+        results = cv.run(train_df, self.MODEL_SPEC)
+
+        assert list(results["fold"]) == [0, 1, 2, 3]
+        assert results["n_test"].sum() == len(train_df)
+        assert results["auc"].between(0, 1).all()
+        assert not results["preprocess_cached"].any()
+
+    def test_fillers_fit_on_fold_training_rows_only(self, train_df):
+        """NaNMeanFiller means come from each fold's training split"""
+        cv = CrossValidator(make_pipeline(), n_splits=3, n_jobs=1)
+        cv.run(train_df, self.MODEL_SPEC)
+
+        fold_train, _ = next(iter(cv._cache.values()))
+        full_mean = train_df["height"].mean()
+        # Imputed training heights equal the fold mean, not the full-data mean
+        imputed = fold_train.loc[train_df["height"].isna() & train_df.index.isin(fold_train.index), "height"]
+        assert imputed.nunique() == 1
+        assert imputed.iloc[0] != pytest.approx(full_mean, abs=1e-12)
+
+    def test_rerun_uses_cache(self, tmp_path, train_df):
+        """A second run (e.g. new hyperparameters) skips preprocessing, also from disk"""
+        cv = CrossValidator(make_pipeline(), n_splits=3, n_jobs=1, cache_dir=tmp_path)
+        first = cv.run(train_df, self.MODEL_SPEC)
+        second = cv.run(train_df, {**self.MODEL_SPEC, "hyperparameters": {"n_estimators": 15, "max_depth": 3}})
+
+        assert not first["preprocess_cached"].any()
+        assert second["preprocess_cached"].all()
+        np.testing.assert_array_equal(first["n_train"], second["n_train"])
+
+        fresh = CrossValidator(make_pipeline(), n_splits=3, n_jobs=1, cache_dir=tmp_path)
+        assert fresh.run(train_df, {**self.MODEL_SPEC, "backend": "logistic", "hyperparameters": {}})[
+            "preprocess_cached"].all()
+
+
+# ============================================================================
+# Stage profiler
+# ============================================================================
+
+
+class TestStageProfiler:
+    """Test suite for StageProfiler"""
+
+    def test_records_each_stage(self, train_df):
+        """Every fit/transform/train/predict call inside the block is recorded"""
+        with StageProfiler() as profiler:
+            pipeline = make_pipeline().fit(train_df)
+            pipeline.predict(train_df)
+
+        summary = profiler.summary()
+        stages = set(summary["stage"])
+        assert {"Pipeline.fit", "NaNRowRemover.transform", "BMICalculator.fit",
+                "DiabetesModel.train", "DiabetesModel.predict"} <= stages
+        remover = summary.set_index("stage").loc["NaNRowRemover.transform"]
+        assert remover["calls"] == 2
+        assert remover["rows_in"] == 2 * len(train_df)
+        assert (summary["wall_s"] >= 0).all()
+        assert (summary["process_max_rss_bytes"] > 0).all()
+        assert (summary["rss_growth_bytes"] >= 0).all()
+
+    def test_rss_growth_is_per_stage(self, train_df):
+        """A cheap stage after a large allocation does not inherit the earlier peak"""
+        big = np.ones(64 * 2**20 // 8)  # raise the process RSS high-water mark first
+        with StageProfiler() as profiler:
+            BMICalculator().fit(train_df)
+        del big
+
+        event = profiler.events[0]
+        assert event["process_max_rss_bytes"] >= 64 * 2**20
+        assert event["rss_growth_bytes"] < 16 * 2**20
+
+    def test_disabled_outside_block(self, train_df):
+        """Nothing is recorded once the block exits"""
+        with StageProfiler() as profiler:
+            pass
+        make_pipeline().fit(train_df)
+
+        assert profiler.events == []
+        assert profiler.summary().empty
+
+    def test_memory_tracing_and_chrome_trace(self, tmp_path, train_df):
+        """trace_memory records allocations and the trace file is valid JSON"""
+        with StageProfiler(trace_memory=True) as profiler:
+            BMICalculator().fit_transform(train_df)
+
+        event = next(e for e in profiler.events if e["stage"] == "BMICalculator.transform")
+        assert event["peak_alloc_bytes"] > 0
+
+        path = tmp_path / "trace.json"
+        profiler.to_chrome_trace(path)
+        trace = json.loads(path.read_text())
+        assert {e["name"] for e in trace["traceEvents"]} == {"BMICalculator.fit", "BMICalculator.transform"}
+        assert all(e["ph"] == "X" for e in trace["traceEvents"])
+
+
+# ============================================================================
+# Drift monitoring
+# ============================================================================
+
+
+class TestDriftMonitor:
+    """Test suite for DriftMonitor"""
+
+    def make_data(self, n=5000, seed=0, shift=0.0, missing=0.0):
+        rng = np.random.default_rng(seed)
+        df = pd.DataFrame({
+            "age": rng.normal(60 + shift, 10, n),
+            "bmi": rng.normal(28, 5, n),
+            "icu_type": rng.choice(["MICU", "SICU", "CTICU"], n, p=[0.5, 0.3, 0.2]),
+        })
+        df.loc[rng.random(n) < missing, "bmi"] = np.nan
+        return df
+
+    def test_no_drift_on_same_distribution(self):
+        """A fresh sample of the training distribution is not flagged"""
+        monitor = DriftMonitor().fit(self.make_data(seed=0))
+        report = monitor.compute_drift(self.make_data(seed=1))
+
+        assert report.index.tolist() == ["age", "bmi", "icu_type"]
+        assert report["kind"].tolist() == ["numeric", "numeric", "categorical"]
+        assert (report["psi"] < 0.02).all()
+        assert (report.loc[["age", "bmi"], "ks"] < 0.05).all()
+        assert not report["drifted"].any()
+
+    def test_detects_shift_and_missingness(self):
+        """A shifted column and a jump in missingness are both flagged"""
+        monitor = DriftMonitor().fit(self.make_data(seed=0))
+        report = monitor.compute_drift(self.make_data(seed=1, shift=8.0, missing=0.25))
+
+        assert report.loc["age", "drifted"]
+        assert report.loc["age", "ks"] > 0.25
+        assert report.loc["bmi", "psi"] < monitor.psi_threshold
+        assert report.loc["bmi", "drifted"]
+        assert report.loc["bmi", "missing_rate_train"] == 0
+        assert report.loc["bmi", "missing_rate_batch"] == pytest.approx(0.25, abs=0.03)
+
+        lenient = DriftMonitor(missing_rate_threshold=0.5).fit(self.make_data(seed=0))
+        assert not lenient.compute_drift(self.make_data(seed=1, missing=0.25)).loc["bmi", "drifted"]
+
+    def test_detects_shift_in_rare_binary_flag(self):
+        """Low-cardinality numeric columns are binned by value, so a prevalence shift is caught"""
+        rng = np.random.default_rng(0)
+        train = pd.DataFrame({"age": rng.normal(60, 10, 5000), "cirrhosis": (rng.random(5000) < 0.03).astype(int)})
+        batch = pd.DataFrame({"age": rng.normal(60, 10, 2000), "cirrhosis": (rng.random(2000) < 0.8).astype(int)})
+        monitor = DriftMonitor().fit(train)
+        report = monitor.compute_drift(batch)
+
+        assert monitor.discrete_columns_ == ["cirrhosis"]
+        assert report.loc["cirrhosis", "kind"] == "discrete"
+        assert report.loc["cirrhosis", "drifted"]
+        assert report.loc["cirrhosis", "ks"] == pytest.approx(0.77, abs=0.03)
+        assert not monitor.compute_drift(train).loc["cirrhosis", "drifted"]
+
+    def test_psi_matches_per_column_computation(self):
+        """The vectorized pass equals a column-by-column PSI on the same bins"""
+        train, batch = self.make_data(seed=0), self.make_data(seed=1, shift=3.0)
+        monitor = DriftMonitor(columns=["age", "bmi"], n_bins=5).fit(train)
+        report = monitor.compute_drift(batch)
+
+        for i, col in enumerate(["age", "bmi"]):
+            edges = monitor.edges_[i]
+            expected = np.bincount(np.searchsorted(edges, train[col], side="right"), minlength=5) / len(train)
+            actual = np.bincount(np.searchsorted(edges, batch[col], side="right"), minlength=5) / len(batch)
+            expected, actual = np.clip(expected, 1e-4, None), np.clip(actual, 1e-4, None)
+            psi = ((actual - expected) * np.log(actual / expected)).sum()
+            assert report.loc[col, "psi"] == pytest.approx(psi)
+
+    def test_unseen_category_and_errors(self):
+        """Unseen categories land in the other bucket; misuse raises"""
+        monitor = DriftMonitor()
+        with pytest.raises(RuntimeError):
+            monitor.compute_drift(self.make_data())
+
+        monitor.fit(self.make_data())
+        batch = self.make_data(seed=1)
+        batch["icu_type"] = "Neuro ICU"
+        assert monitor.compute_drift(batch).loc["icu_type", "drifted"]
+
+        with pytest.raises(ValueError):
+            monitor.compute_drift(batch.drop(columns="age"))
+
+
+# ============================================================================
+# Lazy imports
+# ============================================================================
+
+
+class TestLazyImports:
+    """Test suite for the lazily resolved package namespace"""
+
+    def run_fresh(self, code):
+        import subprocess
+
+        src = str(Path(__file__).parent.parent / "src")
+        result = subprocess.run([sys.executable, "-c", f"import sys; sys.path.insert(0, {src!r}); {code}"],
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+
+    def test_import_does_not_load_sklearn(self):
+        """Importing the package or a preprocessor leaves sklearn unloaded"""
+        code = "import hw5lib; from hw5lib import NaNMeanFiller, Pipeline; print('sklearn' in sys.modules)"
+        assert self.run_fresh(code) == "False"
+
+    def test_exports_resolve(self):
+        """Every name in __all__ resolves, including through star imports"""
+        import hw5lib
+
+        for name in hw5lib.__all__:
+            assert getattr(hw5lib, name) is not None
+        assert set(hw5lib.__all__) <= set(dir(hw5lib))
+        assert self.run_fresh("from hw5lib import *; print(DiabetesModel.__name__)") == "DiabetesModel"
+        with pytest.raises(AttributeError):
+            hw5lib.NotAThing
+
+
+# ============================================================================
+# Batch-scoring CLI
+# ============================================================================
+
+
+class TestScoringCLI:
+    """Test suite for the streaming batch-scoring command"""
+
+    def write_inputs(self, tmp_path, fitted_pipeline, n=1000):
+        df = make_frame(n=n, seed=3).drop(columns="diabetes_mellitus")
+        df.loc[5, "age"] = np.nan  # dropped by NaNRowRemover
+        df.insert(0, "encounter_id", np.arange(n) + 1000)
+        df.to_csv(tmp_path / "input.csv", index=False)
+        fitted_pipeline.save(tmp_path / "pipeline.pkl")
+        return df
+
+    def test_csv_output_matches_pipeline(self, tmp_path, fitted_pipeline, capsys):
+        """Chunked, parallel scoring equals scoring the whole frame at once, in order"""
+        from hw5lib.cli import main
+
+        df = self.write_inputs(tmp_path, fitted_pipeline)
+        main(["--pipeline", str(tmp_path / "pipeline.pkl"), "--input", str(tmp_path / "input.csv"),
+              "--output", str(tmp_path / "out.csv"), "--chunk-rows", "150", "--workers", "2",
+              "--max-in-flight", "2", "--keep", "encounter_id"])
+
+        out = pd.read_csv(tmp_path / "out.csv")
+        expected = fitted_pipeline.predict(df).iloc[:, -1].reindex(df.index)
+        assert out.columns.tolist() == ["row", "encounter_id", "prediction"]
+        assert out["row"].tolist() == list(range(len(df)))
+        assert out["encounter_id"].tolist() == df["encounter_id"].tolist()
+        np.testing.assert_allclose(out["prediction"], expected)
+        assert np.isnan(out.loc[5, "prediction"])
+        assert "rows/s" in capsys.readouterr().err
+
+    def test_parquet_output_in_process(self, tmp_path, fitted_pipeline):
+        """Parquet output and in-process scoring (workers=0)"""
+        pytest.importorskip("pyarrow")
+        from hw5lib.cli import score_csv
+
+        df = self.write_inputs(tmp_path, fitted_pipeline, n=300)
+        stats = score_csv(tmp_path / "pipeline.pkl", tmp_path / "input.csv", tmp_path / "out.parquet",
+                          chunk_rows=100, workers=0, progress=None)
+
+        out = pd.read_parquet(tmp_path / "out.parquet")
+        assert stats["rows"] == 300 and stats["chunks"] == 3
+        np.testing.assert_allclose(out["prediction"], fitted_pipeline.predict(df).iloc[:, -1].reindex(df.index))
+
+    def test_keep_column_clashing_with_output_is_rejected(self, tmp_path, fitted_pipeline):
+        """--keep columns named like a generated column would be overwritten, so they are refused"""
+        from hw5lib.cli import score_csv
+
+        df = self.write_inputs(tmp_path, fitted_pipeline, n=50)
+        df.rename(columns={"encounter_id": "prediction"}).to_csv(tmp_path / "input.csv", index=False)
+        with pytest.raises(ValueError, match="prediction"):
+            score_csv(tmp_path / "pipeline.pkl", tmp_path / "input.csv", tmp_path / "out.csv",
+                      workers=0, keep_columns=["prediction"], progress=None)
+        assert not (tmp_path / "out.csv").exists()
+
+    def test_pipeline_without_model(self, tmp_path):
+        """A pipeline without a model cannot score"""
+        from hw5lib.cli import score_csv
+
+        Pipeline(steps=[AgeSquared()]).save(tmp_path / "steps.pkl")
+        make_frame(n=10).to_csv(tmp_path / "input.csv", index=False)
+        with pytest.raises(ValueError):
+            score_csv(tmp_path / "steps.pkl", tmp_path / "input.csv", tmp_path / "out.csv", workers=0)
+
+
+# ============================================================================
+# Polars engine
+# ============================================================================
+
+
+class TestPolarsEngine:
+    """Test suite for running the stages on polars frames"""
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_pipeline_matches_pandas(self, lazy):
+        """Stages and model give bit-identical results on polars DataFrames and LazyFrames"""
+        pl = pytest.importorskip("polars")
+        df = make_frame()
+        df.loc[::31, "age"] = np.nan
+        test = make_frame(n=200, seed=1)
+
+        expected = make_pipeline().fit(df)
+        frame = pl.from_pandas(df).lazy() if lazy else pl.from_pandas(df)
+        fitted = make_pipeline().fit(frame)
+
+        assert fitted.steps[1].means_ == expected.steps[1].means_
+        assert fitted.steps[3].gender_mapping_ == expected.steps[3].gender_mapping_
+
+        transformed = fitted.transform(pl.from_pandas(df))
+        reference = expected.transform(df)
+        for col in FEATURES + ["height", "weight"]:
+            np.testing.assert_array_equal(transformed[col].cast(pl.Float64).to_numpy(),
+                                          reference[col].to_numpy(dtype=np.float64))
+
+        predictions = fitted.predict(pl.from_pandas(test))
+        assert isinstance(predictions, pd.DataFrame)
+        np.testing.assert_array_equal(predictions.to_numpy(), expected.predict(test).to_numpy())
+
+    def test_loader_matches_pandas_split(self, tmp_path):
+        """The polars loader returns the same rows in the same order"""
+        pl = pytest.importorskip("polars")
+        from hw5lib import DataLoader
+
+        df = make_frame()
+        df.insert(0, "encounter_id", np.arange(len(df)))
+        df.to_csv(tmp_path / "data.csv", index=False)
+
+        train, test = DataLoader(tmp_path / "data.csv").load()
+        train_pl, test_pl = DataLoader(tmp_path / "data.csv", engine="polars").load()
+
+        assert isinstance(train_pl, pl.DataFrame)
+        assert train_pl["encounter_id"].to_list() == train["encounter_id"].tolist()
+        assert test_pl["encounter_id"].to_list() == test["encounter_id"].tolist()
+        assert train_pl["height"].null_count() == train["height"].isna().sum()
+
+    def test_engine_errors(self, monkeypatch):
+        """Unknown engines are rejected and a missing polars gives an install hint"""
+        from hw5lib import DataLoader
+        from hw5lib.frames import import_polars
+
+        with pytest.raises(ValueError):
+            DataLoader("data.csv", engine="spark")
+
+        monkeypatch.setitem(sys.modules, "polars", None)
+        with pytest.raises(ImportError, match="hw5lib\\[polars\\]"):
+            import_polars()
+
+
+# ============================================================================
+# Out-of-core sampling
+# ============================================================================
+
+
+class TestStratifiedSampling:
+    """Test suite for one-pass stratified reservoir sampling"""
+
+    @pytest.fixture
+    def csv_path(self, tmp_path):
+        df = make_frame(n=3000, seed=4)
+        df.insert(0, "encounter_id", np.arange(len(df)))
+        df.to_csv(tmp_path / "data.csv", index=False)
+        return tmp_path / "data.csv"
+
+    def test_sample_and_full_data_stats(self, csv_path):
+        """The sample holds file rows in file order; stats cover the whole file"""
+        from hw5lib import DataLoader
+
+        full = pd.read_csv(csv_path)
+        sample, stats = DataLoader(csv_path).load_sample(500, chunk_rows=256)
+
+        assert len(sample) == 500
+        pd.testing.assert_frame_equal(sample, full.loc[sample.index])
+        assert sample.index.is_monotonic_increasing
+        assert stats["rows"] == len(full)
+        assert stats["class_counts"] == full["diabetes_mellitus"].value_counts().to_dict()
+        assert stats["sample_counts"] == sample["diabetes_mellitus"].value_counts().to_dict()
+        assert stats["missing_counts"]["height"] == full["height"].isna().sum()
+        for col in ["age", "height", "weight"]:
+            assert stats["means"][col] == pytest.approx(full[col].mean(), rel=1e-12)
+        assert "gender" not in stats["means"]
+
+    def test_positive_oversampling(self, csv_path):
+        """positive_fraction fixes the positive share; sampling_rates undo it"""
+        from hw5lib import sample_stratified
+
+        sample, stats = sample_stratified(csv_path, sample_size=400, positive_fraction=0.5, chunk_rows=500)
+
+        assert stats["sample_counts"] == {0: 200, 1: 200}
+        assert (sample["diabetes_mellitus"] == 1).sum() == 200
+        assert stats["sampling_rates"][1] == 200 / stats["class_counts"][1]
+
+    def test_sample_is_uniform_within_class(self, tmp_path):
+        """Every row of a class is equally likely to be drawn, whatever its chunk"""
+        from hw5lib import sample_stratified
+
+        labels = np.r_[np.zeros(40, dtype=int), np.ones(20, dtype=int)]
+        pd.DataFrame({"x": np.arange(60), "diabetes_mellitus": labels}).to_csv(tmp_path / "small.csv", index=False)
+
+        hits = np.zeros(60)
+        for seed in range(200):
+            sample, _ = sample_stratified(tmp_path / "small.csv", sample_size=15, chunk_rows=15, random_state=seed)
+            hits[sample["x"].to_numpy()] += 1
+        # 10 of 40 negatives and 5 of 20 positives per draw: inclusion probability 1/4
+        np.testing.assert_allclose(hits / 200, 0.25, atol=0.12)
+
+    def test_filler_from_means(self):
+        """NaNMeanFiller.from_means gives a fitted filler using the given means"""
+        filler = NaNMeanFiller.from_means({"height": 170.0, "weight": 80.0}, ["height"])
+
+        filled = filler.transform(pd.DataFrame({"height": [np.nan, 160.0], "weight": [np.nan, 70.0]}))
+        assert filled["height"].tolist() == [170.0, 160.0]
+        assert np.isnan(filled.loc[0, "weight"])
+        with pytest.raises(ValueError):
+            NaNMeanFiller.from_means({"height": 170.0}, ["weight"])